@@ -4,8 +4,9 @@ import os
 import shlex
 import subprocess
 
-from gi.repository import Gtk, Gio
-from collections import namedtuple
+from gi.repository import Gtk, Gio, GLib
+from collections import namedtuple, OrderedDict
+from threading import Thread, Lock
 from urllib.request import pathname2url
 from sunflower.common import is_gui_app, decode_file_name, encode_file_name
 from sunflower.parameters import Parameters
@@ -30,9 +31,15 @@ ApplicationInfo = namedtuple(
 class AssociationManager:
 	"""Class that provides 'Open With' menu"""
 
+	sniff_cache_size = 4096  # number of remembered content types detected from file data
+
 	def __init__(self, application):
 		self._application = application
 
+		# content types detected from data, keyed by file identity
+		self._sniff_cache = OrderedDict()
+		self._sniff_cache_lock = Lock()
+
 	def __get_icon(self, icon_object):
 		"""Get icon string from GIO icon object"""
 		result = None
@@ -104,6 +111,75 @@ class AssociationManager:
 
 		return data
 
+	def __get_sniff_key(self, path, provider):
+		"""Return key identifying file content or None if file can't be identified."""
+		try:
+			file_stat = provider.get_stat(path, extended=True, follow=True)
+		except Exception:
+			return None
+
+		# providers not supporting inodes can't be cached reliably
+		if not file_stat.inode:
+			return None
+
+		return (file_stat.device, file_stat.inode, file_stat.time_modify_ns, file_stat.size)
+
+	def sniff_mime_type(self, path, provider):
+		"""Get mime type for specified path, reading file content if it can't be
+		determined from name. Detected types are remembered until file changes."""
+		result = self.get_mime_type(path)
+
+		if not self.is_mime_type_unknown(result):
+			return result
+
+		# check if we have already seen this file
+		key = self.__get_sniff_key(path, provider)
+
+		if key is not None:
+			with self._sniff_cache_lock:
+				cached = self._sniff_cache.get(key)
+
+				if cached is not None:
+					self._sniff_cache.move_to_end(key)
+					return cached
+
+		# detect content type from data
+		data = self.get_sample_data(path, provider)
+		result = self.get_mime_type(data=data)
+
+		if key is not None:
+			with self._sniff_cache_lock:
+				self._sniff_cache[key] = result
+
+				if len(self._sniff_cache) > self.sniff_cache_size:
+					self._sniff_cache.popitem(last=False)
+
+		return result
+
+	def sniff_mime_types(self, path_list, provider, callback=None):
+		"""Get mime types for all paths in list. Result is a dictionary with path as key.
+
+		When callback is specified detection is done in a separate thread and
+		callback is called from main loop with the resulting dictionary.
+
+		"""
+		def detect():
+			result = {}
+
+			for path in path_list:
+				try:
+					result[path] = self.sniff_mime_type(path, provider)
+				except Exception:
+					result[path] = None
+
+			return result
+
+		if callback is None:
+			return detect()
+
+		thread = Thread(target=lambda: GLib.idle_add(callback, detect()), daemon=True)
+		thread.start()
+
 	def get_mime_type(self, path=None, data=None):
 		"""Get mime type for specified path"""
 		result = None
@@ -286,8 +362,7 @@ class AssociationManager:
 
 			# if we still don't know content type, try to guess
 			if self.is_mime_type_unknown(mime_type):
-				data = self.get_sample_data(path, provider)
-				mime_type = self.get_mime_type(data=data)
+				mime_type = self.sniff_mime_type(path, provider)
 
 		if executable_action != ExecutableAction.EXECUTE:
 			should_execute = False
@@ -3,6 +3,9 @@ from __future__ import absolute_import
 import os
 import sqlite3 as sql
 
+from collections import OrderedDict
+from queue import Queue, Empty as QueueEmptyException
+from threading import Thread, RLock
 from gi.repository import Gtk
 from sunflower.common import get_cache_directory, encode_file_name
 
@@ -11,8 +14,15 @@ class EmblemManager:
 	"""Manager class for item emblems.
 
 	This object is used for managing emblems for items as well as rendering Pixbuffs.
+	Emblems are loaded for whole directory at once and kept in memory. Changes are
+	applied to cache immediately and written to database by a separate thread
+	which groups waiting changes into a single transaction. Until written, new
+	state of changed items is kept aside and applied over data read from database.
 
 	"""
+	cache_size = 64  # number of directories whose emblems are kept in memory
+	batch_size = 1000  # maximum number of queued changes written in one transaction
+
 	default_emblems = (
 			'emblem-default',
 			'emblem-documents',
@@ -37,6 +47,12 @@ class EmblemManager:
 	def __init__(self, parent):
 		self._parent = parent
 		self._icon_manager = self._parent.icon_manager
+		self._cache = OrderedDict()
+		self._lock = RLock()
+		self._write_queue = Queue()
+
+		# state of items whose changes are not yet written, by path and item name
+		self._pending = {}
 
 		# connect to database
 		self._connection = self._connect_to_database()
@@ -45,6 +61,10 @@ class EmblemManager:
 		if not self._check_database():
 			self._create_database()
 
+		# start database writer
+		self._writer = Thread(target=self.__write_changes, daemon=True)
+		self._writer.start()
+
 	def _connect_to_database(self):
 		"""Create a connection to database."""
 		cache_directory = get_cache_directory()
@@ -59,6 +79,10 @@ class EmblemManager:
 		result = sql.connect(database_file, check_same_thread=False)
 		result.text_factory = str
 
+		# allow reading while writer thread is in transaction
+		result.execute('PRAGMA journal_mode=WAL')
+		result.execute('PRAGMA synchronous=NORMAL')
+
 		return result
 
 	def _table_exists(self, cursor, table_name):
@@ -109,39 +133,185 @@ class EmblemManager:
 		assert self._connection is not None
 		return self._connection.cursor()
 
-	def add_emblem(self, path, item_name, emblem):
-		"""Add emblems for specified path."""
-		result = False
-		cursor = self._get_cursor()
-
-		# find item id
+	def __write_changes(self):
+		"""Threaded method which writes queued changes to database."""
+		connection = self._connect_to_database()
+		cursor = connection.cursor()
+		running = True
+
+		while running:
+			changes = [self._write_queue.get()]
+
+			# collect other waiting changes
+			while len(changes) < self.batch_size:
+				try:
+					changes.append(self._write_queue.get(False))
+				except QueueEmptyException:
+					break
+
+			try:
+				with connection:
+					for method, params, items in changes:
+						if method is None:
+							running = False
+							break
+
+						method(cursor, *params)
+
+			except sql.Error as error:
+				print('Error writing emblems: {0}'.format(error))
+
+				# database and cache no longer match, reload from database
+				with self._lock:
+					self._cache = OrderedDict()
+
+			finally:
+				with self._lock:
+					for method, params, items in changes:
+						self._clear_pending(items)
+
+				for change in changes:
+					self._write_queue.task_done()
+
+		connection.close()
+
+	def _queue_change(self, method, items, *params):
+		"""Queue database change for writer thread. Items are (path, item_name, emblems)
+		with new state of changed items which is kept aside until change is written."""
+		with self._lock:
+			for path, item_name, emblems in items:
+				item_state = self._pending.setdefault(path, {}).setdefault(item_name, [0, None])
+				item_state[0] += 1
+				item_state[1] = tuple(emblems)
+
+			self._write_queue.put((method, params, items))
+
+	def _clear_pending(self, items):
+		"""Forget state of items once their queued change was written."""
+		for path, item_name, emblems in items:
+			path_state = self._pending.get(path)
+			if path_state is None or item_name not in path_state:
+				continue
+
+			item_state = path_state[item_name]
+			item_state[0] -= 1
+
+			if item_state[0] <= 0:
+				del path_state[item_name]
+				if not path_state:
+					del self._pending[path]
+
+	def _write_item_id(self, cursor, path, item_name, create=True):
+		"""Find item id in database and optionally create it if item doesn't exist."""
 		cursor.execute('SELECT id FROM items WHERE path=? AND name=? LIMIT 1', (path, item_name))
 		data = cursor.fetchone()
 
-		if data is None:
-			# item doesn't exist, insert new one
-			cursor.execute('INSERT INTO items(path, name) VALUES(?, ?)', (path, item_name))
-			item_id = cursor.lastrowid
+		if data is not None:
+			return data[0]
 
-		else:
-			item_id = data[0]
+		if not create:
+			return None
+
+		cursor.execute('INSERT INTO items(path, name) VALUES(?, ?)', (path, item_name))
+		return cursor.lastrowid
+
+	def _write_add(self, cursor, path, item_name, emblem):
+		"""Add emblem to item in database."""
+		item_id = self._write_item_id(cursor, path, item_name)
 
-		# find emblem id
 		cursor.execute('SELECT id FROM emblems WHERE item=? AND value=? LIMIT 1', (item_id, emblem))
-		data = cursor.fetchone()
+		if cursor.fetchone() is None:
+			cursor.execute('INSERT INTO emblems(item, value) VALUES(?, ?)', (item_id, emblem))
+
+	def _write_remove(self, cursor, path, item_name, emblem):
+		"""Remove emblem from item in database."""
+		item_id = self._write_item_id(cursor, path, item_name, create=False)
+
+		if item_id is not None:
+			cursor.execute('DELETE FROM emblems WHERE item=? AND value=?', (item_id, emblem))
+
+	def _write_clear(self, cursor, path, item_name, remove_item=True):
+		"""Remove all emblems of item from database."""
+		item_id = self._write_item_id(cursor, path, item_name, create=False)
+
+		if item_id is not None:
+			cursor.execute('DELETE FROM emblems WHERE item=?', (item_id,))
+
+			if remove_item:
+				cursor.execute('DELETE FROM items WHERE id=?', (item_id,))
+
+	def _write_set(self, cursor, path, item_name, emblems):
+		"""Replace emblems of item in database."""
+		if not emblems:
+			self._write_clear(cursor, path, item_name)
+			return
+
+		item_id = self._write_item_id(cursor, path, item_name)
+		cursor.execute('DELETE FROM emblems WHERE item=?', (item_id,))
+		cursor.executemany(
+				'INSERT INTO emblems(item, value) VALUES(?, ?)',
+				tuple((item_id, emblem) for emblem in emblems)
+			)
+
+	def _write_set_many(self, cursor, items):
+		"""Replace emblems of multiple items in database."""
+		for path, item_name, emblems in items:
+			self._write_set(cursor, path, item_name, emblems)
+
+	def _get_path_cache(self, path):
+		"""Return dictionary with emblem names for all items in path, loading
+		them with a single query when path is not cached."""
+		with self._lock:
+			result = self._cache.get(path)
+
+			if result is not None:
+				self._cache.move_to_end(path)
+				return result
+
+		with self._lock:
+			result = {}
+			cursor = self._get_cursor()
+			cursor.execute(
+					'SELECT items.name, emblems.value FROM items '
+					'JOIN emblems ON emblems.item=items.id '
+					'WHERE items.path=? ORDER BY emblems.id',
+					(path,)
+				)
+
+			for item_name, emblem in cursor.fetchall():
+				result.setdefault(item_name, []).append(emblem)
+
+			# apply changes which are still waiting to be written
+			for item_name, (count, emblems) in self._pending.get(path, {}).items():
+				if emblems:
+					result[item_name] = list(emblems)
+				else:
+					result.pop(item_name, None)
+
+			self._cache[path] = result
+			if len(self._cache) > self.cache_size:
+				self._cache.popitem(last=False)
 
-		# emblem already exists
-		if data is not None:
 			return result
 
-		# add new emblem to item
-		cursor.execute('INSERT INTO emblems(item, value) VALUES(?, ?)', (item_id, emblem))
-		result = True
+	def _filter_emblems(self, emblems):
+		"""Return only emblems available in current icon theme."""
+		icon_theme = Gtk.IconTheme.get_default()
+		return [icon for icon in emblems if icon_theme.has_icon(icon)]
 
-		# commit changes
-		self._connection.commit()
+	def add_emblem(self, path, item_name, emblem):
+		"""Add emblems for specified path."""
+		with self._lock:
+			emblems = self._get_path_cache(path).setdefault(item_name, [])
 
-		return result
+			# emblem already exists
+			if emblem in emblems:
+				return False
+
+			emblems.append(emblem)
+			self._queue_change(self._write_add, ((path, item_name, emblems),), path, item_name, emblem)
+
+		return True
 
 	def toggle_emblem(self, path, item_name, emblem):
 		"""Toggle emblem on specified item."""
@@ -155,100 +325,94 @@ class EmblemManager:
 
 	def set_emblems(self, path, item_name, emblems):
 		"""Set multiple emblems at the same time."""
-		self.clear_emblems(path, item_name, remove_item=False)
-		cursor = self._get_cursor()
+		self.set_emblems_many(((path, item_name, emblems),))
 
-		# find item id
-		cursor.execute('SELECT id FROM items WHERE path=? AND name=? LIMIT 1', (path, item_name))
-		data = cursor.fetchone()
+	def set_emblems_many(self, items):
+		"""Set emblems for multiple items at the same time. Items are specified as
+		iterable of (path, item_name, emblems) and written in a single transaction."""
+		items = tuple((path, item_name, tuple(emblems)) for path, item_name, emblems in items)
 
-		if data is None:
-			# item doesn't exist, insert new one
-			cursor.execute('INSERT INTO items(path, name) VALUES(?, ?)', (path, item_name))
-			item_id = cursor.lastrowid
+		with self._lock:
+			# queue first so paths loaded while updating cache include new state
+			self._queue_change(self._write_set_many, items, items)
 
-		else:
-			item_id = data[0]
+			for path, item_name, emblems in items:
+				path_cache = self._get_path_cache(path)
 
-		# store new emblems
-		data = tuple((item_id, emblem) for emblem in emblems)
-		cursor.executemany('INSERT INTO emblems(item, value) VALUES(?, ?)', data)
-		self._connection.commit()
+				if emblems:
+					path_cache[item_name] = list(emblems)
+				else:
+					path_cache.pop(item_name, None)
 
-	def remove_emblem(self, path, item_name, emblem):
-		"""Remove emblem from path."""
-		result = False
-		cursor = self._get_cursor()
+	def apply_emblem(self, items, emblem, active):
+		"""Add or remove emblem for multiple (path, item_name) items at the same
+		time. Changes are written in a single transaction."""
+		changes = []
 
-		# find item id
-		cursor.execute('SELECT id FROM items WHERE path=? AND name=? LIMIT 1', (path, item_name))
-		data = cursor.fetchone()
+		with self._lock:
+			for path, item_name in items:
+				emblems = list(self._get_path_cache(path).get(item_name, ()))
 
-		# item doesn't exist
-		if data is None:
-			return result
+				if active and emblem not in emblems:
+					emblems.append(emblem)
 
-		# find emblem id
-		cursor.execute('SELECT id FROM emblems WHERE item=? AND value=? LIMIT 1', (data[0], emblem))
-		data = cursor.fetchone()
+				elif not active and emblem in emblems:
+					emblems.remove(emblem)
 
-		# emblem doesn't exist
-		if data is None:
-			return result
+				else:
+					continue
 
-		# remove emblem
-		cursor.execute('DELETE FROM emblems WHERE id=?', (data[0],))
-		self._connection.commit()
-		result = True
+				changes.append((path, item_name, emblems))
 
-		return result
+			if changes:
+				self.set_emblems_many(changes)
 
-	def clear_emblems(self, path, item_name, remove_item=True):
-		"""Clear all emblems for path."""
-		result = False
-		cursor = self._get_cursor()
+		return len(changes) > 0
 
-		# find item id
-		cursor.execute('SELECT id FROM items WHERE path=? AND name=? LIMIT 1', (path, item_name))
-		data = cursor.fetchone()
+	def remove_emblem(self, path, item_name, emblem):
+		"""Remove emblem from path."""
+		with self._lock:
+			path_cache = self._get_path_cache(path)
+			emblems = path_cache.get(item_name)
 
-		# remove emblems
-		if data is not None:
-			cursor.execute('DELETE FROM emblems WHERE item=?', (data[0],))
+			# emblem doesn't exist
+			if emblems is None or emblem not in emblems:
+				return False
 
-			# remove item if requested
-			if remove_item:
-				cursor.execute('DELETE FROM items WHERE id=?', (data[0],))
+			emblems.remove(emblem)
+			if not emblems:
+				del path_cache[item_name]
 
-			# commit changes
-			self._connection.commit()
-			result = True
+			self._queue_change(self._write_remove, ((path, item_name, emblems),), path, item_name, emblem)
+
+		return True
+
+	def clear_emblems(self, path, item_name, remove_item=True):
+		"""Clear all emblems for path."""
+		with self._lock:
+			result = self._get_path_cache(path).pop(item_name, None) is not None
+			self._queue_change(self._write_clear, ((path, item_name, ()),), path, item_name, remove_item)
 
 		return result
 
+	def flush(self):
+		"""Wait for all queued changes to be written to database."""
+		self._write_queue.join()
+
+	def close(self):
+		"""Write queued changes and stop writer thread."""
+		self._queue_change(None, ())
+		self._writer.join()
+
 	def get_emblems(self, path, item_name):
 		"""Get all emblem names for item in path."""
-		result = None
-		cursor = self._get_cursor()
-
-		# find path in database
-		cursor.execute('SELECT id FROM items WHERE path=? AND name=? LIMIT 1', (path, item_name))
-		row = cursor.fetchone()
+		emblems = self._get_path_cache(path).get(item_name)
 
 		# no emblems for this path
-		if row is None:
-			return result
-
-		# get emblems for this item
-		item_id = row[0]
-		cursor.execute('SELECT value FROM emblems WHERE item=?', (item_id,))
+		if emblems is None:
+			return None
 
-		# prepare result
-		icon_theme = Gtk.IconTheme.get_default()
-		result = tuple(row[0] for row in cursor.fetchall())
-		result = [icon for icon in result if icon_theme.has_icon(icon)]
-
-		return result
+		return self._filter_emblems(emblems)
 
 	def get_available_emblems(self):
 		"""Get all available emblems."""
@@ -256,22 +420,9 @@ class EmblemManager:
 
 	def get_emblems_for_path(self, path):
 		"""Get emblems for all items in specified path."""
-		result = {}
-		cursor = self._get_cursor()
+		path_cache = self._get_path_cache(path)
 
-		# get all the items in path
-		cursor.execute('SELECT id, name FROM items WHERE path=?', (path,))
-		items = cursor.fetchall()
+		with self._lock:
+			items = list(path_cache.items())
 
-		# exit if there are no items in path
-		if len(items) == 0:
-			return result
-
-		# get emblems for each item
-		icon_theme = Gtk.IconTheme.get_default()
-		for item_id, item_name in items:
-			cursor.execute('SELECT value FROM emblems WHERE item=?', (item_id,))
-			emblems = tuple(row[0] for row in cursor.fetchall())
-			result[item_name] = [icon for icon in emblems if icon_theme.has_icon(icon)]
-
-		return result
+		return {item_name: self._filter_emblems(emblems) for item_name, emblems in items}
@@ -42,7 +42,10 @@ from sunflower.tools.advanced_rename import AdvancedRename
 from sunflower.tools.find_files import FindFiles
 from sunflower.tools.version_check import VersionCheck
 from sunflower.tools.disk_usage import DiskUsage
+from sunflower.tools.prefetch import DirectoryPrefetcher
 from sunflower.config import Config
+from sunflower.operation import CopyOperation, MoveOperation
+from sunflower.operation_journal import OperationJournal
 
 # user interface imports
 from sunflower.gui.about_window import AboutWindow
@@ -157,6 +160,7 @@ class MainWindow(Gtk.ApplicationWindow):
 		self.indicator = Indicator(self)
 		self.preferences_window = PreferencesWindow(self)
 		self.disk_usage = DiskUsage(self)
+		self.directory_prefetcher = DirectoryPrefetcher(self)
 		self.shortcuts_window = ShortcutsWindow(self)
 
 		# create header bar
@@ -520,6 +524,10 @@ class MainWindow(Gtk.ApplicationWindow):
 
 		# terminate all disk usage threads
 		self.disk_usage.cancel_all()
+		self.directory_prefetcher.cancel_all()
+
+		# write pending emblem changes
+		self.emblem_manager.close()
 
 		# lock keyring
 		self.keyring_manager.lock_keyring()
@@ -1461,6 +1469,61 @@ class MainWindow(Gtk.ApplicationWindow):
 			notebook = (self.left_notebook, self.right_notebook)[active_notebook_index]
 			notebook.get_nth_page(notebook.get_current_page()).focus_main_object()
 
+			# offer to continue operations interrupted when application was closed
+			if self.options.section('operations').get('resume_operations'):
+				GObject.idle_add(self.resume_operations)
+
+	def resume_operations(self):
+		"""Ask user whether to resume copy and move operations which were interrupted."""
+		parent_list = [item for item in (self.get_left_object(), self.get_right_object()) if isinstance(item, ItemList)]
+
+		# providers need item list as their parent
+		if not parent_list:
+			return False
+
+		for journal in OperationJournal.get_unfinished():
+			plan = journal.get_plan()
+			SourceProvider = self.get_provider_by_protocol(plan['source_protocol'])
+			DestinationProvider = self.get_provider_by_protocol(plan['destination_protocol'])
+
+			# plugin providing protocol is not loaded
+			if SourceProvider is None or DestinationProvider is None:
+				journal.close()
+				continue
+
+			if plan['type'] == MoveOperation.journal_type:
+				message = _('Moving of items from "{0}" to "{1}" was interrupted. Do you want to continue?')
+			else:
+				message = _('Copying of items from "{0}" to "{1}" was interrupted. Do you want to continue?')
+
+			dialog = Gtk.MessageDialog(
+									self,
+									Gtk.DialogFlags.DESTROY_WITH_PARENT,
+									Gtk.MessageType.QUESTION,
+									Gtk.ButtonsType.YES_NO,
+									message.format(plan['source_path'], plan['destination_path'])
+								)
+			dialog.set_default_response(Gtk.ResponseType.YES)
+			result = dialog.run()
+			dialog.destroy()
+
+			if result != Gtk.ResponseType.YES:
+				journal.remove()
+				continue
+
+			OperationClass = MoveOperation if plan['type'] == MoveOperation.journal_type else CopyOperation
+			operation = OperationClass(
+									self,
+									SourceProvider(parent_list[0], plan['source_path']),
+									DestinationProvider(parent_list[-1], plan['destination_path']),
+									dict(plan['options']),
+									plan['destination_path'],
+									journal
+								)
+			operation.start()
+
+		return False
+
 	def create_tab(self, notebook, plugin_class=None, options=None):
 		"""Safe create tab"""
 		if options is None:
@@ -1888,6 +1951,8 @@ class MainWindow(Gtk.ApplicationWindow):
 					'force_directories': False,
 					'show_expanders': False,
 					'second_extension': False,
+					'compact_model': False,
+					'prefetch_directories': False,
 					'always_visible': []
 				})
 
@@ -1901,6 +1966,9 @@ class MainWindow(Gtk.ApplicationWindow):
 					'overwrite_in_silent': True,
 					'trash_files': True,
 					'reserve_size': False,
+					'clone_files': True,
+					'resume_operations': True,
+					'copy_workers': 4,
 					'automount_start': False,
 					'automount_insert': False,
 					'follow_symlink': False
@@ -514,3 +514,29 @@ class RenameDialog(OperationDialog):
 		# set default icon
 		if icon_name is None:
 			self._operation_image.set_from_icon_name('edit-find-replace', Gtk.IconSize.MENU)
+
+
+class ThumbnailDialog(OperationDialog):
+	"""Dialog displayed while generating thumbnails"""
+
+	def __init__(self, application, thread):
+		OperationDialog.__init__(self, application, thread)
+
+		# create additional controls
+		self._add_current_file()
+		self._add_buttons()
+
+		# configure layout
+		self.set_status(_('Generating thumbnails...'))
+		self.set_current_file('')
+
+		# show all elements
+		self._container.show_all()
+
+	def _set_operation_image(self, icon_name=None):
+		"""Set default or specified operation image"""
+		OperationDialog._set_operation_image(self, icon_name)
+
+		# set default icon
+		if icon_name is None:
+			self._operation_image.set_from_icon_name('image-x-generic-symbolic', Gtk.IconSize.BUTTON)
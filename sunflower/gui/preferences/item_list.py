@@ -67,6 +67,13 @@ class ItemListOptions(SettingsPage):
 		self._checkbox_media_preview = Gtk.CheckButton(_('Fast media preview'))
 		self._checkbox_show_expanders = Gtk.CheckButton(_('Show tree expanders'))
 		self._checkbox_second_extension = Gtk.CheckButton(_('Support second level extension'))
+		self._checkbox_compact_model = Gtk.CheckButton(_('Compact list storage for large directories'))
+		self._checkbox_compact_model.set_tooltip_text(_(
+									'Store items in compact form and format them only when shown. '
+									'Expanding directories is not available in this mode. '
+									'Applies to newly opened tabs.'
+								))
+		self._checkbox_prefetch_directories = Gtk.CheckButton(_('Prefetch neighbouring directories in background'))
 
 		self._checkbox_row_hinting.connect('toggled', self._parent.enable_save)
 		self._checkbox_case_sensitive.connect('toggled', self._parent.enable_save)
@@ -77,6 +84,8 @@ class ItemListOptions(SettingsPage):
 		self._checkbox_media_preview.connect('toggled', self._parent.enable_save)
 		self._checkbox_show_expanders.connect('toggled', self._parent.enable_save)
 		self._checkbox_second_extension.connect('toggled', self._parent.enable_save)
+		self._checkbox_compact_model.connect('toggled', self._parent.enable_save)
+		self._checkbox_prefetch_directories.connect('toggled', self._parent.enable_save)
 
 		# file access mode format
 		hbox_mode_format = Gtk.HBox(False, 5)
@@ -394,6 +403,8 @@ class ItemListOptions(SettingsPage):
 		vbox_operation.pack_start(self._checkbox_single_click, False, False, 0)
 		vbox_operation.pack_start(self._checkbox_right_click, False, False, 0)
 		vbox_operation.pack_start(self._checkbox_second_extension, False, False, 0)
+		vbox_operation.pack_start(self._checkbox_compact_model, False, False, 0)
+		vbox_operation.pack_start(self._checkbox_prefetch_directories, False, False, 0)
 		vbox_operation.pack_start(hbox_executable_action, False, False, 5)
 		vbox_operation.pack_start(hbox_quick_search, False, False, 5)
 		vbox_operation.pack_start(vbox_time_format, False, False, 5)
@@ -672,6 +683,8 @@ class ItemListOptions(SettingsPage):
 		self._checkbox_load_directories.set_active(section.get('force_directories'))
 		self._checkbox_show_expanders.set_active(section.get('show_expanders'))
 		self._checkbox_second_extension.set_active(section.get('second_extension'))
+		self._checkbox_compact_model.set_active(section.get('compact_model'))
+		self._checkbox_prefetch_directories.set_active(section.get('prefetch_directories'))
 
 		search_modifier = section.get('search_modifier')
 		self._checkbox_control.set_active(search_modifier[0] == '1')
@@ -724,6 +737,8 @@ class ItemListOptions(SettingsPage):
 		section.set('force_directories', self._checkbox_load_directories.get_active())
 		section.set('show_expanders', self._checkbox_show_expanders.get_active())
 		section.set('second_extension', self._checkbox_second_extension.get_active())
+		section.set('compact_model', self._checkbox_compact_model.get_active())
+		section.set('prefetch_directories', self._checkbox_prefetch_directories.get_active())
 
 		search_modifier = "%d%d%d" % (
 				self._checkbox_control.get_active(),
@@ -21,12 +21,28 @@ class OperationOptions(SettingsPage):
 		# create components
 		self._checkbox_trash_files = Gtk.CheckButton(_('Delete items to trashcan'))
 		self._checkbox_reserve_size = Gtk.CheckButton(_('Reserve free space on copy/move'))
+		self._checkbox_clone_files = Gtk.CheckButton(_('Clone files instead of copying when possible'))
+		self._checkbox_resume_operations = Gtk.CheckButton(_('Offer to resume interrupted copy/move operations'))
 		self._checkbox_automount_on_start = Gtk.CheckButton(_('Automount drives on start up'))
 		self._checkbox_automount_on_insert = Gtk.CheckButton(_('Automount removable drives when inserted'))
 		self._checkbox_confirm_delete = Gtk.CheckButton(_('Show confirmation dialog before deleting items'))
 
 		self._checkbox_trash_files.connect('toggled', self._parent.enable_save)
 		self._checkbox_reserve_size.connect('toggled', self._parent.enable_save)
+		self._checkbox_clone_files.connect('toggled', self._parent.enable_save)
+		self._checkbox_resume_operations.connect('toggled', self._parent.enable_save)
+
+		# number of files copied at the same time
+		hbox_copy_workers = Gtk.HBox(False, 5)
+		label_copy_workers = Gtk.Label(label=_('Number of files copied at the same time:'))
+		label_copy_workers.set_alignment(0, 0.5)
+
+		adjustment = Gtk.Adjustment(1, 1, 16, 1, 4, 0)
+		self._spin_copy_workers = Gtk.SpinButton(adjustment=adjustment, digits=0)
+		self._spin_copy_workers.connect('value-changed', self._parent.enable_save)
+
+		hbox_copy_workers.pack_start(label_copy_workers, False, False, 0)
+		hbox_copy_workers.pack_start(self._spin_copy_workers, False, False, 0)
 		self._checkbox_automount_on_start.connect('toggled', self._parent.enable_save)
 		self._checkbox_automount_on_insert.connect('toggled', self._parent.enable_save)
 		self._checkbox_confirm_delete.connect('toggled', self._confirm_delete_toggle)
@@ -34,6 +50,9 @@ class OperationOptions(SettingsPage):
 		# pack user interface
 		vbox_general.pack_start(self._checkbox_trash_files, False, False, 0)
 		vbox_general.pack_start(self._checkbox_reserve_size, False, False, 0)
+		vbox_general.pack_start(self._checkbox_clone_files, False, False, 0)
+		vbox_general.pack_start(self._checkbox_resume_operations, False, False, 0)
+		vbox_general.pack_start(hbox_copy_workers, False, False, 5)
 
 		vbox_mounts.pack_start(self._checkbox_automount_on_start, False, False, 0)
 		vbox_mounts.pack_start(self._checkbox_automount_on_insert, False, False, 0)
@@ -83,6 +102,9 @@ class OperationOptions(SettingsPage):
 		# load options
 		self._checkbox_trash_files.set_active(operations.get('trash_files'))
 		self._checkbox_reserve_size.set_active(operations.get('reserve_size'))
+		self._checkbox_clone_files.set_active(operations.get('clone_files'))
+		self._checkbox_resume_operations.set_active(operations.get('resume_operations'))
+		self._spin_copy_workers.set_value(operations.get('copy_workers'))
 		self._checkbox_automount_on_start.set_active(operations.get('automount_start'))
 		self._checkbox_automount_on_insert.set_active(operations.get('automount_insert'))
 		self._checkbox_confirm_delete.set_active(confirmations.get('delete_items'))
@@ -96,6 +118,9 @@ class OperationOptions(SettingsPage):
 		# save settings
 		operations.set('trash_files', self._checkbox_trash_files.get_active())
 		operations.set('reserve_size', self._checkbox_reserve_size.get_active())
+		operations.set('clone_files', self._checkbox_clone_files.get_active())
+		operations.set('resume_operations', self._checkbox_resume_operations.get_active())
+		operations.set('copy_workers', self._spin_copy_workers.get_value_as_int())
 		operations.set('automount_start', self._checkbox_automount_on_start.get_active())
 		operations.set('automount_insert', self._checkbox_automount_on_insert.get_active())
 		confirmations.set('delete_items', self._checkbox_confirm_delete.get_active())
@@ -44,12 +44,8 @@ class PropertiesWindow(Gtk.Window):
 			self._mime_type = 'inode/directory'
 
 		else:
-			self._mime_type = application.associations_manager.get_mime_type(self._path)
-
-			# content type is unknown, try to detect using content
-			if application.associations_manager.is_mime_type_unknown(self._mime_type):
-				data = application.associations_manager.get_sample_data(path, provider)
-				self._mime_type = application.associations_manager.get_mime_type(data=data)
+			# detect content type, using file content if needed
+			self._mime_type = application.associations_manager.sniff_mime_type(path, provider)
 
 		# file monitor, we'd like to update info if file changes
 		self._create_monitor()
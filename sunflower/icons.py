@@ -2,7 +2,9 @@ from __future__ import absolute_import
 from builtins import filter
 
 import os
+import re
 import sys
+import fnmatch
 import zipfile
 
 from gi.repository import Gtk, Gio, GdkPixbuf, GLib
@@ -12,6 +14,8 @@ from sunflower.common import UserDirectory, get_user_directory, get_static_asset
 class IconManager:
 	"""Icon manager class provides easy and abstract way of dealing with icons"""
 
+	cache_size = 4096  # maximum number of file types with remembered icons
+
 	def __init__(self, parent):
 		self._parent = parent
 		self._icon_theme = Gtk.IconTheme.get_default()
@@ -19,9 +23,102 @@ class IconManager:
 		self._default_file = None
 		self._default_directory = None
 
+		# resolved icon names and their existence in theme
+		self._file_icons = {}
+		self._icon_exists = {}
+
+		# file name patterns which can't be matched by extension alone
+		self._compound_extensions = None
+		self._name_patterns = None
+		self._load_mime_patterns()
+
 		# preload information
 		self._prepare_icons()
 
+		# cached information depends on icon theme
+		self._icon_theme.connect('changed', self._handle_theme_change)
+
+	def _handle_theme_change(self, icon_theme):
+		"""Forget resolved icons when icon theme changes"""
+		self._file_icons = {}
+		self._icon_exists = {}
+		self._prepare_icons()
+
+	def _load_mime_patterns(self):
+		"""Load file name patterns from shared MIME database which type of some
+		files depends on besides their last extension."""
+		data_directories = [GLib.get_user_data_dir()] + list(GLib.get_system_data_dirs())
+		compound_extensions = set()
+		name_patterns = []
+		found = False
+
+		for directory in data_directories:
+			try:
+				with open(os.path.join(directory, 'mime', 'globs2'), 'r') as raw_file:
+					lines = raw_file.readlines()
+
+			except (IOError, OSError, UnicodeDecodeError):
+				continue
+
+			found = True
+
+			for line in lines:
+				if line.startswith('#'):
+					continue
+
+				parts = line.rstrip('\n').split(':')
+				if len(parts) < 3:
+					continue
+
+				pattern = parts[2]
+				extension = pattern[1:] if pattern.startswith('*.') else None
+
+				if extension is not None and not any(char in extension for char in '*?['):
+					# multiple extensions like .tar.gz
+					if extension.count('.') > 1:
+						compound_extensions.add(extension.lower())
+
+				else:
+					# literal names and other patterns like README* or Makefile.*
+					name_patterns.append(fnmatch.translate(pattern))
+
+		if not found:
+			return
+
+		self._compound_extensions = compound_extensions
+		if name_patterns:
+			self._name_patterns = re.compile('|'.join(name_patterns), re.IGNORECASE)
+
+	def _get_file_type_key(self, filename):
+		"""Return part of file name which determines its type.
+
+		Last extension is used unless name ends with known multiple extensions.
+		Names matched by literal or other patterns in MIME database and names
+		without extension are used whole. Case is preserved as some of the MIME
+		type patterns are case sensitive.
+
+		"""
+		name = os.path.basename(filename)
+
+		# without patterns from MIME database only whole names are safe to use
+		if self._compound_extensions is None:
+			return name
+
+		if self._name_patterns is not None and self._name_patterns.match(name):
+			return name
+
+		position = name.find('.', 1)
+
+		while position > 0:
+			extension = name[position:]
+
+			if extension.count('.') == 1 or extension.lower() in self._compound_extensions:
+				return extension
+
+			position = name.find('.', position + 1)
+
+		return name
+
 	def _prepare_icons(self):
 		"""Load special user directories"""
 		# set default icons for file and directory
@@ -61,7 +158,13 @@ class IconManager:
 
 	def has_icon(self, icon_name):
 		"""Check if icon with specified name exists in theme"""
-		return self._icon_theme.has_icon(icon_name)
+		result = self._icon_exists.get(icon_name)
+
+		if result is None:
+			result = self._icon_theme.has_icon(icon_name)
+			self._icon_exists[icon_name] = result
+
+		return result
 
 	def get_icon_sizes(self, icon_name):
 		"""Get icon sizes for specified name"""
@@ -69,6 +172,22 @@ class IconManager:
 
 	def get_icon_for_file(self, filename):
 		"""Load icon for specified file"""
+		key = self._get_file_type_key(filename)
+		result = self._file_icons.get(key)
+
+		if result is None:
+			result = self._resolve_icon_for_file(filename)
+
+			# prevent unbounded growth with many unique names
+			if len(self._file_icons) >= self.cache_size:
+				self._file_icons = {}
+
+			self._file_icons[key] = result
+
+		return result
+
+	def _resolve_icon_for_file(self, filename):
+		"""Find icon for specified file based on its MIME type"""
 		result = self._default_file
 		mime_type = self._parent.associations_manager.get_mime_type(filename)
 		themed_icon = None
@@ -1,20 +1,25 @@
 from __future__ import absolute_import
 
 import os
+import errno
 import fnmatch
+import threading
 
 from gi.repository import Gtk, GObject
-from queue import Queue
-from threading import Thread, Event
+from collections import deque, namedtuple
+from queue import Queue, Empty as QueueEmptyException
+from threading import Thread, Event, Lock, RLock
 
 from sunflower.gui.input_dialog import OverwriteFileDialog, OverwriteDirectoryDialog, OperationError
-from sunflower.gui.operation_dialog import CopyDialog, MoveDialog, DeleteDialog, RenameDialog
+from sunflower.gui.operation_dialog import CopyDialog, MoveDialog, DeleteDialog, RenameDialog, ThumbnailDialog
 from sunflower.gui.error_list import ErrorList
-from sunflower.plugin_base.provider import Mode as FileMode, TrashError, Support as ProviderSupport
+from sunflower.plugin_base.provider import Mode as FileMode, TrashError, Support as ProviderSupport, FileType
 from sunflower.plugin_base.monitor import MonitorSignals
 from sunflower.common import format_size
+from sunflower.operation_journal import OperationJournal
 from sunflower.queue import OperationQueue
 from sunflower.gui.input_dialog import OverwriteOption
+from sunflower.widgets.thumbnail_view import create_thumbnail_factory
 
 
 class BufferSize:
@@ -51,11 +56,233 @@ class OperationType:
 	DELETE = 2
 	RENAME = 3
 	LINK = 4
+	THUMBNAIL = 5
+
+
+ProgressSnapshot = namedtuple(
+				'ProgressSnapshot',
+				[
+					'size',  # bytes processed since last snapshot
+					'count',  # items processed since last snapshot
+					'total_size',  # bytes added to total since last snapshot
+					'total_count',  # items added to total since last snapshot
+					'file',  # current file or None if it didn't change
+					'fraction',  # current file progress or None if it didn't change
+					'pulse',  # true if progress bar should pulse
+					'changed'  # paths which were modified
+				])
+
+
+class OperationProgress:
+	"""Collects progress reported by operation threads so it can be shown
+	periodically instead of after every change."""
+
+	def __init__(self):
+		self._lock = Lock()
+		self._reset()
+
+	def _reset(self):
+		"""Clear collected progress."""
+		self._size = 0
+		self._count = 0
+		self._total_size = 0
+		self._total_count = 0
+		self._file = None
+		self._fraction = None
+		self._pulse = False
+		self._changed = set()
+
+	def add(self, size=0, count=0, total_size=0, total_count=0):
+		"""Add to processed and total amounts."""
+		with self._lock:
+			self._size += size
+			self._count += count
+			self._total_size += total_size
+			self._total_count += total_count
+
+	def set_file(self, path):
+		"""Set file currently being processed."""
+		self._file = path
+
+	def set_fraction(self, fraction):
+		"""Set progress of current file."""
+		self._fraction = fraction
+
+	def pulse(self):
+		"""Request progress bar pulse."""
+		self._pulse = True
+
+	def changed(self, path):
+		"""Mark path as modified."""
+		with self._lock:
+			self._changed.add(path)
+
+	def take(self):
+		"""Return collected progress and start collecting again."""
+		with self._lock:
+			result = ProgressSnapshot(
+					self._size,
+					self._count,
+					self._total_size,
+					self._total_count,
+					self._file,
+					self._fraction,
+					self._pulse,
+					self._changed
+				)
+			self._reset()
+
+		return result
+
+
+class CopyPipeline:
+	"""Reads source file in separate thread while data is being written.
+
+	Data is read into fixed number of preallocated buffers which are
+	passed to writer and returned for reuse once written, so reading
+	can't get further ahead than number of buffers allows. Buffers and
+	reader thread are kept between files, call `start` for each file
+	and `finish` when done with it.
+
+	"""
+
+	buffer_count = 3
+
+	def __init__(self, buffer_size):
+		self._destination = None
+		self._free = Queue()
+		self._filled = Queue()
+		self._sources = Queue()
+		self._thread = None
+		self._active = False
+		self._cancel = Event()
+		self._idle = Event()
+
+		for index in range(self.buffer_count):
+			self._free.put(bytearray(buffer_size))
+
+	def __read(self):
+		"""Threaded method which fills free buffers with data from each source."""
+		while True:
+			source = self._sources.get()
+
+			# pipeline was closed
+			if source is None:
+				break
+
+			readinto = getattr(source, 'readinto', None)
+
+			while True:
+				buffer = self._free.get()
+
+				# writer is done with this file
+				if buffer is None or self._cancel.is_set():
+					if buffer is not None:
+						self._free.put(buffer)
+					break
+
+				try:
+					if readinto is not None:
+						size = readinto(buffer) or 0
+					else:
+						data = source.read(len(buffer))
+						size = len(data)
+						buffer[:size] = data
+
+				except Exception as error:
+					self._free.put(buffer)
+					self._filled.put(error)
+					break
+
+				self._filled.put((buffer, size))
+
+				# end of file
+				if not size:
+					break
+
+			self._idle.set()
+
+	def start(self, source, destination):
+		"""Start reading ahead from source for writing to destination."""
+		self._destination = destination
+		self._cancel.clear()
+		self._idle.clear()
+		self._active = True
+
+		if self._thread is None:
+			self._thread = Thread(target=self.__read, daemon=True)
+			self._thread.start()
+
+		self._sources.put(source)
+
+	def copy_chunk(self, count=None):
+		"""Write next chunk read from source to destination and return its size."""
+		item = self._filled.get()
+
+		# pass reading errors to writer
+		if isinstance(item, Exception):
+			raise item
+
+		buffer, size = item
+
+		if size:
+			data = memoryview(buffer)[:size]
+
+			# only real files can write directly from buffer
+			if not hasattr(self._destination, 'fileno'):
+				data = data.tobytes()
+
+			self._destination.write(data)
+
+		self._free.put(buffer)
+
+		return size
+
+	def finish(self):
+		"""Stop reading current file and return all buffers for reuse."""
+		if not self._active:
+			return
+
+		# wake up reader if it's waiting for free buffer
+		self._cancel.set()
+		self._free.put(None)
+		self._idle.wait()
+
+		# collect buffers which were not written along with wake up marker
+		buffers = []
+		for queue in (self._free, self._filled):
+			while True:
+				try:
+					item = queue.get(False)
+				except QueueEmptyException:
+					break
+
+				if isinstance(item, tuple):
+					buffers.append(item[0])
+				elif isinstance(item, bytearray):
+					buffers.append(item)
+
+		for buffer in buffers:
+			self._free.put(buffer)
+
+		self._destination = None
+		self._active = False
+
+	def close(self):
+		"""Stop reading and wait for reader thread to finish."""
+		self.finish()
+
+		if self._thread is not None:
+			self._sources.put(None)
+			self._thread.join()
+			self._thread = None
 
 
 class Operation(Thread):
 	"""Parent class for all operation threads"""
 
+	progress_interval = 100  # milliseconds between progress updates
+
 	def __init__(self, application, source, destination=None, options=None, destination_path=None):
 		Thread.__init__(self, target=self)
 		self._can_continue = Event()
@@ -70,6 +297,9 @@ class Operation(Thread):
 		self._overwrite_all = None
 		self._response_cache = {}
 
+		# only one question is asked at a time
+		self._input_lock = RLock()
+
 		# operation queue
 		self._operation_queue = None
 		self._operation_queue_name = None
@@ -81,6 +311,10 @@ class Operation(Thread):
 		self._dialog = None
 		self._create_dialog()
 
+		# show progress periodically
+		self._progress = OperationProgress()
+		self._progress_timeout = GObject.timeout_add(self.progress_interval, self.__show_progress)
+
 		self._dir_list = []
 		self._file_list = []
 		self._link_list = []
@@ -98,8 +332,51 @@ class Operation(Thread):
 		"""Create operation dialog"""
 		pass
 
+	def __show_progress(self):
+		"""Show progress collected since last update."""
+		if self._progress_timeout is None or self._dialog is None:
+			return False
+
+		progress = self._progress.take()
+
+		if progress.total_size:
+			self._dialog.increment_total_size(progress.total_size)
+
+		if progress.total_count:
+			self._dialog.increment_total_count(progress.total_count)
+
+		if progress.size:
+			self._dialog.increment_current_size(progress.size)
+
+		if progress.count:
+			self._dialog.increment_current_count(progress.count)
+
+		if progress.file is not None:
+			self._dialog.set_current_file(progress.file)
+
+		if progress.fraction is not None:
+			self._dialog.set_current_file_fraction(progress.fraction)
+
+		if progress.pulse:
+			self._dialog.pulse()
+
+		self.__notify_changed(progress.changed)
+
+		return True
+
+	def __notify_changed(self, paths):
+		"""Notify monitor about modified files."""
+		if self._destination_queue is not None:
+			for path in paths:
+				self._destination_queue.put((MonitorSignals.CHANGED, path, None), False)
+
 	def _destroy_ui(self):
 		"""Destroy user interface"""
+		self._progress_timeout = None
+
+		# files modified since the last update would otherwise never be reported
+		self.__notify_changed(self._progress.take().changed)
+
 		if self._dialog is not None:
 			GObject.idle_add(self._dialog.destroy)
 
@@ -142,9 +419,7 @@ class Operation(Thread):
 				queue.put(result == Gtk.ResponseType.YES)
 
 			# show dialog in main thread
-			queue = Queue()
-			GObject.idle_add(ask_user, queue)
-			should_continue = queue.get(True)
+			should_continue = self._ask_user(ask_user)
 
 		return should_continue
 
@@ -184,9 +459,7 @@ class Operation(Thread):
 			queue.put((result, merge))
 
 		# show dialog in main thread
-		queue = Queue()
-		GObject.idle_add(ask_user, queue)
-		result, merge = queue.get(True)
+		result, merge = self._ask_user(ask_user)
 
 		if result[1][OverwriteOption.APPLY_TO_ALL]:
 			self._merge_all = merge
@@ -197,8 +470,25 @@ class Operation(Thread):
 
 		return merge  # return only response for current directory
 
+	def _ask_user(self, ask_user):
+		"""Show dialog in main thread and return result it provides. When multiple
+		threads need input questions are asked one after another."""
+		with self._input_lock:
+			queue = Queue()
+			GObject.idle_add(ask_user, queue)
+			return queue.get(True)
+
 	def _get_overwrite_input(self, path):
 		"""Get overwrite confirmation"""
+		with self._input_lock:
+			# other thread got answer for all files while we were waiting
+			if self._overwrite_all is not None:
+				return self._overwrite_all, (False, '', True)
+
+			return self.__get_overwrite_input(path)
+
+	def __get_overwrite_input(self, path):
+		"""Ask user for overwrite confirmation"""
 		if self._options is not None and self._options[Option.SILENT]:
 			# we are in silent mode, do what user specified
 			overwrite = self._options[Option.SILENT_OVERWRITE]
@@ -234,9 +524,7 @@ class Operation(Thread):
 				queue.put((result, overwrite))
 
 			# show dialog in main thread
-			queue = Queue()
-			GObject.idle_add(ask_user, queue)
-			result, overwrite = queue.get(True)
+			result, overwrite = self._ask_user(ask_user)
 
 			if result[1][OverwriteOption.APPLY_TO_ALL]:
 				self._overwrite_all = overwrite
@@ -283,9 +571,7 @@ class Operation(Thread):
 				queue.put(response)
 
 			# show dialog in main thread
-			queue = Queue()
-			GObject.idle_add(ask_user, queue)
-			response = queue.get(True)
+			response = self._ask_user(ask_user)
 
 		return response
 
@@ -333,9 +619,7 @@ class Operation(Thread):
 				queue.put(response)
 
 			# show dialog in main thread
-			queue = Queue()
-			GObject.idle_add(ask_user, queue)
-			response = queue.get(True)
+			response = self._ask_user(ask_user)
 
 		return response
 
@@ -372,9 +656,7 @@ class Operation(Thread):
 				queue.put(response)
 
 			# show dialog in main thread
-			queue = Queue()
-			GObject.idle_add(ask_user, queue)
-			response = queue.get(True)
+			response = self._ask_user(ask_user)
 
 		return response
 
@@ -411,9 +693,7 @@ class Operation(Thread):
 				queue.put(response)
 
 			# show dialog in main thread
-			queue = Queue()
-			GObject.idle_add(ask_user, queue)
-			response = queue.get(True)
+			response = self._ask_user(ask_user)
 
 		return response
 
@@ -450,9 +730,7 @@ class Operation(Thread):
 				queue.put(response)
 
 			# show dialog in main thread
-			queue = Queue()
-			GObject.idle_add(ask_user, queue)
-			response = queue.get(True)
+			response = self._ask_user(ask_user)
 
 		return response
 
@@ -489,9 +767,7 @@ class Operation(Thread):
 				queue.put(response)
 
 			# show dialog in main thread
-			queue = Queue()
-			GObject.idle_add(ask_user, queue)
-			response = queue.get(True)
+			response = self._ask_user(ask_user)
 
 		return response
 
@@ -528,9 +804,7 @@ class Operation(Thread):
 				queue.put(response)
 
 			# show dialog in main thread
-			queue = Queue()
-			GObject.idle_add(ask_user, queue)
-			response = queue.get(True)
+			response = self._ask_user(ask_user)
 
 		return response
 
@@ -567,9 +841,7 @@ class Operation(Thread):
 				queue.put(response)
 
 			# show dialog in main thread
-			queue = Queue()
-			GObject.idle_add(ask_user, queue)
-			response = queue.get(True)
+			response = self._ask_user(ask_user)
 
 		return response
 
@@ -617,7 +889,14 @@ class Operation(Thread):
 class CopyOperation(Operation):
 	"""Operation thread used for copying files"""
 
-	def __init__(self, application, source, destination, options, destination_path=None):
+	concurrent_size_limit = 16 * 1024 * 1024  # larger files are copied one at a time
+	verify_size = 64 * 1024  # bytes compared before continuing partially copied file
+	journal_type = 'copy'
+
+	# errors meaning copy method is not supported for specified files
+	unsupported_copy_errors = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF)
+
+	def __init__(self, application, source, destination, options, destination_path=None, journal=None):
 		Operation.__init__(self, application, source, destination, options, destination_path)
 
 		self._merge_all = None
@@ -627,12 +906,32 @@ class CopyOperation(Operation):
 		self._total_count = 0
 		self._total_size = 0
 		self._buffer_size = 0
+		self._file_size = {}
+		self._file_list_lock = Lock()
+
+		# each copying thread reuses its own read ahead buffers
+		self._pipelines = threading.local()
+
+		# journal of interrupted operation which is being resumed
+		self._journal = journal
+		self._resumed = journal is not None
 
 		# cache settings
 		should_reserve = self._application.options.section('operations').get('reserve_size')
 		supported_by_provider = ProviderSupport.RESERVE_SIZE in self._destination.get_support()
 		self._reserve_size = should_reserve and supported_by_provider
 
+		# files on the same provider can share data instead of being copied
+		should_clone = self._application.options.section('operations').get('clone_files')
+		self._clone_files = (
+				should_clone
+				and self._source.__class__ is self._destination.__class__
+				and ProviderSupport.CLONE in self._destination.get_support()
+			)
+
+		# both files are local so kernel can copy data without passing it through us
+		self._kernel_copy = self._source.is_local and self._destination.is_local
+
 		# detect buffer size
 		if self._source.is_local and self._destination.is_local:
 			system_stat = self._destination.get_system_size(self._destination_path)
@@ -669,8 +968,8 @@ class CopyOperation(Operation):
 			self._can_continue.wait()  # pause lock
 
 			# update current file label
-			GObject.idle_add(self._dialog.set_current_file, item)
-			GObject.idle_add(self._dialog.pulse)
+			self._progress.set_file(item)
+			self._progress.pulse()
 
 			if os.path.sep in item:
 				relative_path, item = os.path.split(item)
@@ -708,13 +1007,97 @@ class CopyOperation(Operation):
 				# item is a file, get stats and update lists
 				item_stat = self._source.get_stat(item, relative_to=source_path)
 
-				GObject.idle_add(self._dialog.increment_total_size, item_stat.size)
-				GObject.idle_add(self._dialog.increment_total_count, 1)
+				self._progress.add(total_size=item_stat.size, total_count=1)
 
 				self._total_count += 1
 				self._total_size += item_stat.size
 
 				self._file_list.append((item, relative_path))
+				self._file_size[(item, relative_path)] = item_stat.size
+
+	def _create_journal(self):
+		"""Record operation plan so operation can be resumed if interrupted"""
+		if not self._application.options.section('operations').get('resume_operations'):
+			return
+
+		# journal can only be resumed if providers can be created again
+		if self._source.protocol is None or self._destination.protocol is None:
+			return
+
+		journal = OperationJournal()
+
+		try:
+			journal.create({
+					'type': self.journal_type,
+					'source_protocol': self._source.protocol,
+					'source_path': self._source_path,
+					'destination_protocol': self._destination.protocol,
+					'destination_path': self._destination_path,
+					'options': list(self._options.items()),
+					'dir_list': self._dir_list,
+					'dir_list_create': self._dir_list_create,
+					'link_list': self._link_list,
+					'file_list': self._file_list,
+					'file_size': [self._file_size.get(item, 0) for item in self._file_list]
+				})
+
+		except (IOError, OSError, TypeError, ValueError):
+			# operation can still be completed without journal
+			journal.remove()
+			return
+
+		self._journal = journal
+
+	def _load_journal(self):
+		"""Restore lists from journal of interrupted operation"""
+		plan = self._journal.get_plan()
+
+		self._dir_list = [tuple(item) for item in plan['dir_list']]
+		self._dir_list_create = [tuple(item) for item in plan['dir_list_create']]
+		self._link_list = [tuple(item) for item in plan['link_list']]
+		self._file_list = []
+		files_done = self._journal.is_stage_done('files')
+
+		for item, size in zip(plan['file_list'], plan['file_size']):
+			item = tuple(item)
+
+			if self._journal.is_skipped(item):
+				continue
+
+			self._file_list.append(item)
+			self._file_size[item] = size
+			self._progress.add(total_size=size, total_count=1)
+
+			# completed files count as copied
+			if files_done or self._journal.is_done(item):
+				self._progress.add(size=size, count=1)
+				continue
+
+			self._total_count += 1
+			self._total_size += size
+
+		if self._journal.is_stage_done('links'):
+			self._link_list = []
+
+		if self._journal.is_stage_done('directories'):
+			self._dir_list_create = []
+
+	def _prepare_lists(self):
+		"""Find files for copying or restore them from journal when resuming"""
+		if self._resumed:
+			self._load_journal()
+
+		else:
+			self._get_lists()
+
+			if not self._abort.is_set():
+				self._create_journal()
+
+	def _finish_journal(self):
+		"""Remove journal once operation is no longer running"""
+		if self._journal is not None:
+			self._journal.remove()
+			self._journal = None
 
 	def _set_mode(self, path, mode):
 		"""Set mode for specified path"""
@@ -833,8 +1216,8 @@ class CopyOperation(Operation):
 			if self._abort.is_set(): break  # abort operation if requested
 			self._can_continue.wait()  # pause lock
 
-			GObject.idle_add(self._dialog.set_current_file, os.path.join(directory, item))
-			GObject.idle_add(self._dialog.pulse)
+			self._progress.set_file(os.path.join(directory, item))
+			self._progress.pulse()
 
 			full_name = os.path.join(directory, item)
 
@@ -861,13 +1244,13 @@ class CopyOperation(Operation):
 				# item is a file, update global statistics
 				item_stat = self._source.get_stat(full_name, relative_to=source_path)
 
-				GObject.idle_add(self._dialog.increment_total_size, item_stat.size)
-				GObject.idle_add(self._dialog.increment_total_count, 1)
+				self._progress.add(total_size=item_stat.size, total_count=1)
 
 				self._total_count += 1
 				self._total_size += item_stat.size
 
 				self._file_list.append((full_name, relative_path))
+				self._file_size[(full_name, relative_path)] = item_stat.size
 
 	def _create_directory(self, directory, relative_path=None):
 		"""Create specified directory"""
@@ -913,16 +1296,171 @@ class CopyOperation(Operation):
 		# set owner
 		self._set_owner(directory, file_stat.user_id, file_stat.group_id)
 
+	def _get_copy_methods(self, sh, dh):
+		"""Return list of methods for copying file content ordered by preference.
+		Each method copies up to specified number of bytes and returns number
+		of bytes copied."""
+		result = []
+
+		def copy_chunk(count):
+			data = sh.read(count)
+			dh.write(data)
+			return len(data)
+
+		if self._kernel_copy:
+			source_fd = sh.fileno()
+			destination_fd = dh.fileno()
+
+			if hasattr(os, 'copy_file_range'):
+				result.append(lambda count: os.copy_file_range(source_fd, destination_fd, count))
+
+			if hasattr(os, 'sendfile'):
+				result.append(lambda count: os.sendfile(destination_fd, source_fd, None, count))
+
+		result.append(copy_chunk)
+
+		return result
+
+	def _get_data_regions(self, sh, size):
+		"""Return list of (start, end) regions containing data in sparse source
+		file or None if file has no holes or they can't be detected."""
+		if not self._kernel_copy or not hasattr(os, 'SEEK_DATA'):
+			return None
+
+		result = deque()
+		source_fd = sh.fileno()
+		position = 0
+
+		try:
+			# files without holes use all of their blocks
+			file_stat = os.fstat(source_fd)
+			if file_stat.st_blocks * 512 >= file_stat.st_size:
+				return None
+
+			while position < size:
+				try:
+					start = os.lseek(source_fd, position, os.SEEK_DATA)
+
+				except OSError as error:
+					# rest of the file is a hole
+					if error.errno == errno.ENXIO:
+						break
+					raise
+
+				position = os.lseek(source_fd, start, os.SEEK_HOLE)
+				result.append((start, min(position, size)))
+
+		except OSError:
+			# file system doesn't support looking for holes
+			result = None
+
+		finally:
+			sh.seek(0)
+
+		return result
+
+	def _skip_hole(self, sh, dh, data_regions, position, size):
+		"""Skip hole at specified position in both files. Returns size of skipped
+		hole and number of bytes which can be copied before next hole."""
+		while data_regions and data_regions[0][1] <= position:
+			data_regions.popleft()
+
+		if not data_regions:
+			# hole at the end of file
+			if position < size:
+				sh.seek(size)
+				dh.seek(size)
+				return size - position, 0
+
+			# copy whatever was appended since we looked for holes
+			return 0, self._buffer_size
+
+		start, end = data_regions[0]
+
+		if start > position:
+			sh.seek(start)
+			dh.seek(start)
+			return start - position, 0
+
+		return 0, min(self._buffer_size, end - position)
+
+	def _get_pipeline(self):
+		"""Return read ahead pipeline of current thread."""
+		pipeline = getattr(self._pipelines, 'pipeline', None)
+
+		if pipeline is None:
+			pipeline = CopyPipeline(self._buffer_size)
+			self._pipelines.pipeline = pipeline
+
+		return pipeline
+
+	def _close_pipeline(self):
+		"""Release read ahead pipeline of current thread."""
+		pipeline = getattr(self._pipelines, 'pipeline', None)
+
+		if pipeline is not None:
+			pipeline.close()
+			self._pipelines.pipeline = None
+
+	def _clone_file(self, sh, dh):
+		"""Try to make destination share data with source. Returns True on success."""
+		try:
+			self._destination.clone_file(sh, dh)
+
+		except OSError:
+			# file system doesn't support cloning, copy data instead
+			return False
+
+		return True
+
+	def _verify_offset(self, sh, dest_file, offset):
+		"""Return offset from which partially copied file can be continued. Data
+		before recorded offset is compared with source and file is copied from
+		the beginning if it doesn't match."""
+		try:
+			dest_stat = self._destination.get_stat(dest_file, relative_to=self._destination_path)
+			offset = min(offset, dest_stat.size)
+			start = max(0, offset - self.verify_size)
+
+			if offset == 0:
+				return 0
+
+			vh = self._destination.get_file_handle(dest_file, FileMode.READ, relative_to=self._destination_path)
+
+			try:
+				vh.seek(start)
+				destination_data = vh.read(offset - start)
+
+			finally:
+				vh.close()
+
+			sh.seek(start)
+			source_data = sh.read(offset - start)
+
+		except Exception:
+			return 0
+
+		return offset if source_data == destination_data else 0
+
 	def _copy_file(self, file_name, relative_path=None):
 		"""Copy file content"""
 		can_proceed = True
 		source_path = self._source_path if relative_path is None else os.path.join(self._source_path, relative_path)
 		dest_file = file_name
+		item = (file_name, relative_path)
+		partial = None
 		sh = None
 		dh = None
 
+		if self._journal is not None:
+			partial = self._journal.get_partial(item)
+
+		if partial is not None:
+			# file was partially copied before operation was interrupted
+			dest_file = partial[0]
+
 		# check if destination file exists
-		if self._destination.exists(file_name, relative_to=self._destination_path):
+		elif self._destination.exists(file_name, relative_to=self._destination_path):
 			if self._overwrite_all is not None:
 				can_proceed = self._overwrite_all
 
@@ -941,11 +1479,15 @@ class CopyOperation(Operation):
 
 		# if user skipped this file return
 		if not can_proceed:
-			self._file_list.pop(self._file_list.index((file_name, relative_path)))
+			with self._file_list_lock:
+				self._file_list.remove((file_name, relative_path))
+
+			if self._journal is not None:
+				self._journal.set_skipped(item)
 
 			# update total size
 			file_stat = self._source.get_stat(file_name, relative_to=source_path)
-			GObject.idle_add(self._dialog.increment_current_size, file_stat.size)
+			self._progress.add(size=file_stat.size)
 			return
 
 		try:
@@ -953,9 +1495,10 @@ class CopyOperation(Operation):
 			destination_size = 0
 			file_stat = self._source.get_stat(file_name, relative_to=source_path, extended=True)
 
-			# get file handles
+			# get file handles, partially copied file is continued without truncating
+			destination_mode = FileMode.WRITE if partial is None else FileMode.APPEND
 			sh = self._source.get_file_handle(file_name, FileMode.READ, relative_to=source_path)
-			dh = self._destination.get_file_handle(dest_file, FileMode.WRITE, relative_to=self._destination_path)
+			dh = self._destination.get_file_handle(dest_file, destination_mode, relative_to=self._destination_path)
 
 			# report error properly
 			if sh is None:
@@ -964,8 +1507,16 @@ class CopyOperation(Operation):
 			if dh is None:
 				raise Exception('Unable to open destination file in write mode.')
 
+			if partial is not None:
+				# continue from the last offset whose data matches source
+				destination_size = self._verify_offset(sh, dest_file, partial[1])
+				dh.truncate(destination_size)
+				sh.seek(destination_size)
+
+				self._progress.add(size=destination_size)
+
 			# reserve file size
-			if self._reserve_size:
+			elif self._reserve_size:
 				# try to reserve file size in advance,
 				# can be slow on memory cards and network
 				try:
@@ -978,7 +1529,14 @@ class CopyOperation(Operation):
 				# just truncate file to 0 size in case source file is smaller
 				dh.truncate()
 
-			dh.seek(0)
+			if partial is None:
+				dh.seek(0)
+
+			# record large file as started so it's continued instead of overwritten
+			if self._journal is not None \
+			and partial is None \
+			and file_stat.size >= self._journal.offset_interval:
+				self._journal.set_offset(item, dest_file, dh, 0, force=True)
 
 			# push event to the queue
 			if self._destination_queue is not None:
@@ -1001,58 +1559,118 @@ class CopyOperation(Operation):
 
 			else:
 				# user didn't want to retry, remove file from list
-				self._file_list.pop(self._file_list.index((file_name, relative_path)))
+				with self._file_list_lock:
+					self._file_list.remove((file_name, relative_path))
 
 			# remove amount of copied bytes from total size
-			GObject.idle_add(self._dialog.increment_current_size, -destination_size)
+			self._progress.add(size=-destination_size)
 
 			# exit method
 			return
 
+		pipeline = None
+
+		# clone whole file at once, loop below only finishes the file
+		if partial is None and self._clone_files and self._clone_file(sh, dh):
+			copy_methods = [lambda count: 0]
+			destination_size = file_stat.size
+			data_regions = None
+
+			self._progress.add(size=file_stat.size)
+			self._progress.set_fraction(1)
+
+		else:
+			# find holes in sparse files so they are not written with zeros,
+			# continued files are appended to so holes can't be skipped in them
+			data_regions = None
+			if partial is None:
+				data_regions = self._get_data_regions(sh, file_stat.size)
+
+			copy_methods = self._get_copy_methods(sh, dh)
+
+			# continued files are opened for appending which kernel methods don't support
+			if partial is not None:
+				copy_methods = copy_methods[-1:]
+
+			# overlap reading and writing when kernel can't copy data directly
+			if data_regions is None and not self._kernel_copy and file_stat.size > self._buffer_size:
+				pipeline = self._get_pipeline()
+				pipeline.start(sh, dh)
+				copy_methods.insert(0, pipeline.copy_chunk)
+
+		copy_chunk = copy_methods.pop(0)
+
+		def next_copy_method():
+			"""Continue copying with next method from current position."""
+			if pipeline is not None:
+				pipeline.finish()
+
+			sh.seek(destination_size)
+			dh.seek(destination_size)
+
+			return copy_methods.pop(0)
+
 		while True:
 			if self._abort.is_set(): break
 			self._can_continue.wait()  # pause lock
 
-			data = sh.read(self._buffer_size)
+			skipped, count = 0, self._buffer_size
+			if data_regions is not None:
+				skipped, count = self._skip_hole(sh, dh, data_regions, destination_size, file_stat.size)
 
-			if data:
-				try:
-					# try writing data to destination
-					dh.write(data)
+			try:
+				# skipped holes count as copied to keep progress at apparent size
+				copied = skipped or copy_chunk(count)
 
-				except IOError as error:
-					# handle error
-					if Skip.WRITE in self._response_cache:
-						response = self._response_cache[Skip.WRITE]
-					else:
-						response = self._get_write_error_input(error)
+			except OSError as error:
+				if copy_methods and error.errno in self.unsupported_copy_errors:
+					# method is not supported for these files, continue with next one
+					copy_chunk = next_copy_method()
+					continue
 
-					# try to write data again
-					if response == OperationError.RESPONSE_RETRY:
-						GObject.idle_add(self._dialog.increment_current_size, -dh.tell())
-						if hasattr(sh, 'close'): sh.close()
-						if hasattr(dh, 'close'): sh.close()
+				if pipeline is not None:
+					pipeline.finish()
 
-						self._copy_file(dest_file)
+				# handle error
+				if Skip.WRITE in self._response_cache:
+					response = self._response_cache[Skip.WRITE]
+				else:
+					response = self._get_write_error_input(error)
+
+				# try to write data again
+				if response == OperationError.RESPONSE_RETRY:
+					self._progress.add(size=-dh.tell())
+					if hasattr(sh, 'close'): sh.close()
+					if hasattr(dh, 'close'): sh.close()
+
+					self._copy_file(dest_file)
+
+				return
 
-					return
+			# some file systems report end of file without copying anything
+			if not copied and copy_methods and destination_size < file_stat.size:
+				copy_chunk = next_copy_method()
+				continue
 
-				destination_size += len(data)
-				GObject.idle_add(self._dialog.increment_current_size, len(data))
+			if copied:
+				destination_size += copied
+				self._progress.add(size=copied)
 				if file_stat.size > 0:  # ensure we don't end up with error on 0 size files
-					GObject.idle_add(
-									self._dialog.set_current_file_fraction,
-									destination_size / float(file_stat.size)
-								)
+					self._progress.set_fraction(destination_size / float(file_stat.size))
 				else:
-					GObject.idle_add(self._dialog.set_current_file_fraction, 1)
+					self._progress.set_fraction(1)
 
-				# push event to the queue
-				if self._destination_queue is not None:
-					event = (MonitorSignals.CHANGED, dest_file, None)
-					self._destination_queue.put(event, False)
+				# notify monitor about change
+				self._progress.changed(dest_file)
+
+				if self._journal is not None:
+					self._journal.set_offset(item, dest_file, dh, destination_size)
 
 			else:
+				# restore holes at the end of file
+				if data_regions is not None:
+					dh.truncate(destination_size)
+
 				sh.close()
 				dh.close()
 
@@ -1067,8 +1685,15 @@ class CopyOperation(Operation):
 								file_stat.time_change_ns
 							)
 
+				if self._journal is not None:
+					self._journal.set_done(item)
+
 				break
 
+		# stop reading ahead
+		if pipeline is not None:
+			pipeline.finish()
+
 	def _create_link(self, link_name, relative_path=None):
 		"""Create specified link"""
 		can_proceed = True
@@ -1125,31 +1750,74 @@ class CopyOperation(Operation):
 			if self._abort.is_set(): break  # abort operation if requested
 			self._can_continue.wait()  # pause lock
 
-			GObject.idle_add(self._dialog.set_current_file, directory[0])
+			self._progress.set_file(directory[0])
 			self._create_directory(directory[0], directory[1])  # create directory
 
-			GObject.idle_add(
-						self._dialog.set_current_file_fraction,
-						float(number) / len(self._dir_list)
-					)
+			self._progress.set_fraction(float(number) / len(self._dir_list))
+
+		if self._journal is not None and not self._abort.is_set():
+			self._journal.set_stage_done('directories')
 
 	def _copy_file_list(self):
 		"""Copy list of files to destination path"""
+		# all files were copied before operation was interrupted
+		if self._journal is not None and self._journal.is_stage_done('files'):
+			return
+
 		# update status
 		GObject.idle_add(self._update_status, _('Copying files...'))
 
-		item_list = self._file_list[:]
+		worker_count = self._application.options.section('operations').get('copy_workers')
+		small_files = Queue()
+		large_files = Queue()
 
-		# copy all the files in list
-		for file_name, source_path in item_list:
+		# small files are copied concurrently, large ones one at a time
+		for item in self._file_list[:]:
+			# file was copied before operation was interrupted
+			if self._journal is not None and self._journal.is_done(item):
+				continue
+
+			if self._file_size.get(item, 0) < self.concurrent_size_limit:
+				small_files.put(item)
+			else:
+				large_files.put(item)
+
+		workers = []
+		for index in range(min(worker_count, small_files.qsize()) - 1):
+			worker = Thread(target=self._copy_queued_files, args=(small_files,), daemon=True)
+			worker.start()
+			workers.append(worker)
+
+		# this thread copies files as well
+		self._copy_queued_files(small_files)
+
+		for worker in workers:
+			worker.join()
+
+		self._copy_queued_files(large_files)
+
+		# files which were not recorded as done could otherwise be copied again
+		if self._journal is not None and not self._abort.is_set():
+			self._journal.set_stage_done('files')
+
+	def _copy_queued_files(self, file_queue):
+		"""Copy files from queue until it's empty"""
+		while True:
 			# abort operation if requested
 			if self._abort.is_set(): break
 			self._can_continue.wait()  # pause lock
 
+			try:
+				file_name, source_path = file_queue.get(False)
+			except QueueEmptyException:
+				break
+
 			# copy file
-			GObject.idle_add(self._dialog.set_current_file, file_name)
+			self._progress.set_file(file_name)
 			self._copy_file(file_name, source_path)
-			GObject.idle_add(self._dialog.increment_current_count, 1)
+			self._progress.add(count=1)
+
+		self._close_pipeline()
 
 	def _create_links(self):
 		GObject.idle_add(self._update_status, _('Creating links...'))
@@ -1159,9 +1827,12 @@ class CopyOperation(Operation):
 			self._can_continue.wait()  # pause lock
 
 			#create link
-			GObject.idle_add(self._dialog.set_current_file, link_name)
+			self._progress.set_file(link_name)
 			self._create_link(link_name, source_path)
 
+		if self._journal is not None and not self._abort.is_set():
+			self._journal.set_stage_done('links')
+
 	def run(self):
 		"""Main thread method, this is where all the stuff is happening"""
 		# set dialog info
@@ -1173,7 +1844,7 @@ class CopyOperation(Operation):
 			self._operation_queue.wait()
 
 		# get list of items to copy
-		self._get_lists()
+		self._prepare_lists()
 
 		# check for available free space
 		system_info = self._destination.get_system_size(self._destination_path)
@@ -1192,12 +1863,14 @@ class CopyOperation(Operation):
 			if self._source_path == parent.path:
 				parent.deselect_all()
 
-		GObject.idle_add(clear_selection)
+		if not self._resumed:
+			GObject.idle_add(clear_selection)
 
 		# perform operation
 		self._create_links()
 		self._create_directory_list()
 		self._copy_file_list()
+		self._finish_journal()
 
 		# notify user if window is not focused
 		def show_notification():
@@ -1294,7 +1967,11 @@ class MoveOperation(CopyOperation):
 
 		# if user skipped this file return
 		if not can_proceed:
-			self._file_list.pop(self._file_list.index((file_name, relative_path)))
+			with self._file_list_lock:
+				self._file_list.remove((file_name, relative_path))
+
+			if self._journal is not None:
+				self._journal.set_skipped((file_name, relative_path))
 			return
 
 		# move file
@@ -1314,6 +1991,9 @@ class MoveOperation(CopyOperation):
 				event = (MonitorSignals.CREATED, dest_file, None)
 				self._destination_queue.put(event, False)
 
+			if self._journal is not None:
+				self._journal.set_done((file_name, relative_path))
+
 		except Exception as error:
 			# problem with moving file, ask user what to do
 			if Skip.MOVE in self._response_cache:
@@ -1334,6 +2014,10 @@ class MoveOperation(CopyOperation):
 
 	def _move_file_list(self):
 		"""Move files from the list"""
+		# all files were moved before operation was interrupted
+		if self._journal is not None and self._journal.is_stage_done('files'):
+			return
+
 		GObject.idle_add(self._update_status, _('Moving files...'))
 
 		item_list = self._file_list[:]
@@ -1341,10 +2025,24 @@ class MoveOperation(CopyOperation):
 			if self._abort.is_set(): break  # abort operation if requested
 			self._can_continue.wait()  # pause lock
 
+			# file was moved before operation was interrupted
+			if self._journal is not None and self._journal.is_done((file_name, source_path)):
+				continue
+
+			# record of moved file might have been lost when operation was interrupted
+			if self._resumed:
+				relative_path = self._source_path if source_path is None else os.path.join(self._source_path, source_path)
+				if not self._source.exists(file_name, relative_to=relative_path):
+					self._progress.add(count=1)
+					continue
+
 			# move file
-			GObject.idle_add(self._dialog.set_current_file, file_name)
+			self._progress.set_file(file_name)
 			self._move_file(file_name, source_path)
-			GObject.idle_add(self._dialog.increment_current_count, 1)
+			self._progress.add(count=1)
+
+		if self._journal is not None and not self._abort.is_set():
+			self._journal.set_stage_done('files')
 
 	def _delete_file_list(self):
 		"""Remove files from source list"""
@@ -1356,15 +2054,18 @@ class MoveOperation(CopyOperation):
 			if self._abort.is_set(): break  # abort operation if requested
 			self._can_continue.wait()  # pause lock
 
+			# file was removed before operation was interrupted
+			if self._resumed:
+				source_path = self._source_path if item[1] is None else os.path.join(self._source_path, item[1])
+				if not self._source.exists(item[0], relative_to=source_path):
+					continue
+
 			# remove path
-			GObject.idle_add(self._dialog.set_current_file, item[0])
+			self._progress.set_file(item[0])
 			self._remove_path(item[0], self._file_list, item[1])
 
 			# update current count
-			GObject.idle_add(
-						self._dialog.set_current_file_fraction,
-						float(number) / len(item_list)
-					)
+			self._progress.set_fraction(float(number) / len(item_list))
 
 		self._delete_directories()
 
@@ -1382,7 +2083,7 @@ class MoveOperation(CopyOperation):
 			self._can_continue.wait()  # pause lock
 
 			if self._source.exists(directory, relative_to=source_path):
-				GObject.idle_add(self._dialog.set_current_file, directory)
+				self._progress.set_file(directory)
 
 				# try to get a list of items inside of directory
 				try:
@@ -1397,14 +2098,11 @@ class MoveOperation(CopyOperation):
 
 				# update current count
 				if len(dir_list) > 0:
-					GObject.idle_add(
-								self._dialog.set_current_file_fraction,
-								float(number) / len(dir_list)
-							)
+					self._progress.set_fraction(float(number) / len(dir_list))
 
 				else:
 					# prevent division by zero
-					GObject.idle_add(self._dialog.set_current_file_fraction, 1)
+					self._progress.set_fraction(1)
 
 	def _check_devices(self):
 		"""Check if source and destination are on the same file system"""
@@ -1429,7 +2127,7 @@ class MoveOperation(CopyOperation):
 			self._operation_queue.wait()
 
 		# get list of items
-		self._get_lists()
+		self._prepare_lists()
 
 		# check for available free space
 		system_info = self._destination.get_system_size(self._destination_path)
@@ -1447,7 +2145,8 @@ class MoveOperation(CopyOperation):
 			if self._source_path == parent.path:
 				parent.deselect_all()
 
-		GObject.idle_add(clear_selection)
+		if not self._resumed:
+			GObject.idle_add(clear_selection)
 
 		# create directories
 		self._create_links()
@@ -1464,6 +2163,8 @@ class MoveOperation(CopyOperation):
 			self._copy_file_list()
 			self._delete_file_list()
 
+		self._finish_journal()
+
 		# notify user if window is not focused
 		def notify_is_not_focused():
 			if not self._dialog.is_active() and not self._application.is_active() and not self._abort.is_set():
@@ -1597,19 +2298,16 @@ class DeleteOperation(Operation):
 			if self._abort.is_set(): break  # abort operation if requested
 			self._can_continue.wait()  # pause lock
 
-			GObject.idle_add(self._dialog.set_current_file, item)
+			self._progress.set_file(item)
 			remove_method(item)
 
 			# update current count
 			if len(self._file_list) > 0:
-				GObject.idle_add(
-							self._dialog.set_current_file_fraction,
-							float(index) / len(self._file_list)
-						)
+				self._progress.set_fraction(float(index) / len(self._file_list))
 
 			else:
 				# prevent division by zero
-				GObject.idle_add(self._dialog.set_current_file_fraction, 1)
+				self._progress.set_fraction(1)
 
 		# notify user if window is not focused
 		def show_notification():
@@ -1712,19 +2410,16 @@ class RenameOperation(Operation):
 			if self._abort.is_set(): break  # abort operation if requested
 			self._can_continue.wait()  # pause lock
 
-			GObject.idle_add(self._dialog.set_current_file, item[0])
+			self._progress.set_file(item[0])
 			self._rename_path(item[0], item[1], index-1)
 
 			# update current count
 			if len(self._file_list) > 0:
-				GObject.idle_add(
-							self._dialog.set_current_file_fraction,
-							float(index) / len(self._file_list)
-						)
+				self._progress.set_fraction(float(index) / len(self._file_list))
 
 			else:
 				# prevent division by zero
-				GObject.idle_add(self._dialog.set_current_file_fraction, 1)
+				self._progress.set_fraction(1)
 
 		# notify user if window is not focused
 		def notify_is_not_focused():
@@ -1752,3 +2447,192 @@ class RenameOperation(Operation):
 		# start next operation
 		if self._operation_queue is not None:
 			OperationQueue.start_next(self._operation_queue_name)
+
+
+class ThumbnailOperation(Operation):
+	"""Operation thread used for generating thumbnails for directory trees"""
+
+	worker_count = 2  # number of thumbnails generated at the same time
+
+	def __init__(self, application, provider):
+		Operation.__init__(self, application, provider)
+
+		self._factory = create_thumbnail_factory()
+		self._lock = Lock()
+		self._processed_count = 0
+		self._generated_count = 0
+
+	def _create_dialog(self):
+		"""Create operation dialog"""
+		self._dialog = ThumbnailDialog(self._application, self)
+
+	def _set_low_priority(self):
+		"""Lower CPU and I/O priority of calling thread. Unless explicitly
+		set, I/O priority on Linux is derived from thread's nice value."""
+		try:
+			os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+		except (AttributeError, OSError):
+			pass
+
+	def _scan_directory(self, directory):
+		"""Recursively scan directory and populate list of files"""
+		try:
+			item_list = self._source.list_dir_with_stat(directory, relative_to=self._source_path)
+
+		except Exception as error:
+			# problem with reading specified directory, ask user
+			if Skip.READ in self._response_cache:
+				response = self._response_cache[Skip.READ]
+			else:
+				response = self._get_read_error_input(error)
+
+			# try to scan specified directory again
+			if response == OperationError.RESPONSE_RETRY:
+				self._scan_directory(directory)
+
+			return
+
+		for entry in item_list:
+			if self._abort.is_set(): break  # abort operation if requested
+			self._can_continue.wait()  # pause lock
+
+			full_name = os.path.join(directory, entry.name)
+			self._progress.set_file(full_name)
+			self._progress.pulse()
+
+			if entry.info.type is FileType.DIRECTORY:
+				# don't follow links to avoid loops
+				if not entry.is_link:
+					self._scan_directory(full_name)
+
+			else:
+				self._file_list.append((full_name, int(entry.info.time_modify)))
+
+	def _get_lists(self):
+		"""Find all files which could have thumbnails"""
+		GObject.idle_add(self._dialog.set_status, _('Searching for files...'))
+
+		for item in self._selection_list:
+			if self._abort.is_set(): break  # abort operation if requested
+			self._can_continue.wait()  # pause lock
+
+			try:
+				item_stat = self._source.get_stat(item, relative_to=self._source_path, follow=True)
+			except Exception:
+				continue
+
+			if item_stat.type is FileType.DIRECTORY:
+				self._scan_directory(item)
+			else:
+				self._file_list.append((item, int(item_stat.time_modify)))
+
+	def _generate_thumbnail(self, path, modify_time):
+		"""Generate thumbnail for specified path unless valid one already exists.
+		Returns True if new thumbnail was created."""
+		full_path = os.path.join(self._source_path, path)
+		uri = '{0}://{1}'.format(self._source.protocol, full_path)
+
+		# thumbnail is up to date or we already failed to create it
+		if self._factory.lookup(uri, modify_time):
+			return False
+
+		if self._factory.has_valid_failed_thumbnail(uri, modify_time):
+			return False
+
+		# make sure file type is supported
+		mime_type = self._application.associations_manager.get_mime_type(full_path)
+		if not self._factory.can_thumbnail(uri, mime_type, modify_time):
+			return False
+
+		try:
+			thumbnail = self._factory.generate_thumbnail(uri, mime_type)
+		except Exception:
+			thumbnail = None
+
+		if thumbnail is None:
+			self._factory.create_failed_thumbnail(uri, modify_time)
+			return False
+
+		self._factory.save_thumbnail(thumbnail, uri, modify_time)
+		return True
+
+	def _process_files(self, file_queue):
+		"""Worker thread method which generates thumbnails for queued files"""
+		self._set_low_priority()
+		total_count = len(self._file_list)
+
+		while not self._abort.is_set():
+			self._can_continue.wait()  # pause lock
+
+			try:
+				path, modify_time = file_queue.get(False)
+			except QueueEmptyException:
+				break
+
+			self._progress.set_file(path)
+
+			try:
+				generated = self._generate_thumbnail(path, modify_time)
+			except Exception:
+				generated = False
+
+			with self._lock:
+				self._processed_count += 1
+				self._generated_count += int(generated)
+				fraction = float(self._processed_count) / total_count
+
+			self._progress.set_fraction(fraction)
+
+	def run(self):
+		"""Main thread method, this is where all the stuff is happening"""
+		# wait for operation queue if needed
+		if self._operation_queue is not None:
+			self._operation_queue.wait()
+
+		if self._factory is not None:
+			self._set_low_priority()
+			self._get_lists()
+
+		# generate thumbnails using limited number of threads
+		if self._file_list and not self._abort.is_set():
+			GObject.idle_add(self._dialog.set_status, _('Generating thumbnails...'))
+
+			file_queue = Queue()
+			for item in self._file_list:
+				file_queue.put(item)
+
+			workers = []
+			for index in range(min(self.worker_count, len(self._file_list))):
+				worker = Thread(target=self._process_files, args=(file_queue,), daemon=True)
+				worker.start()
+				workers.append(worker)
+
+			for worker in workers:
+				worker.join()
+
+		# notify user if window is not focused
+		def show_notification():
+			if not self._dialog.is_active() and not self._application.is_active() and not self._abort.is_set():
+				notify_manager = self._application.notification_manager
+
+				title = _('Thumbnail Operation')
+				message = ngettext(
+								'Generated {0} thumbnail in "{1}"!',
+								'Generated {0} thumbnails in "{1}"!',
+								self._generated_count
+							).format(
+				        self._generated_count,
+				        os.path.basename(self._source_path)
+				    )
+
+				# queue notification
+				notify_manager.notify(title, message)
+
+		GObject.idle_add(show_notification)
+
+		# destroy dialog
+		GObject.idle_add(self._destroy_ui)
+
+		# start next operation
+		if self._operation_queue is not None:
+			OperationQueue.start_next(self._operation_queue_name)
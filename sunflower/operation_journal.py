@@ -0,0 +1,262 @@
+from __future__ import absolute_import
+
+import os
+import json
+import time
+import uuid
+import fcntl
+
+from threading import Lock
+from sunflower.common import get_cache_directory
+
+
+class JournalEntry:
+	DONE = 'done'
+	SKIPPED = 'skipped'
+	OFFSET = 'offset'
+	STAGE = 'stage'
+
+
+class OperationJournal:
+	"""On-disk record of copy or move operation used to resume it after
+	application was closed or crashed before operation was completed.
+
+	Journal consists of a plan, written once files were found, and a log
+	to which completed files and offsets of partially written files are
+	appended. Log is locked while journal is in use so other instances
+	don't offer to resume the same operation.
+
+	"""
+
+	directory_name = 'sunflower_operations'
+	offset_interval = 64 * 1024 * 1024  # bytes written between recorded offsets
+	sync_count = 100  # maximum number of entries written before log is synced
+	sync_interval = 1  # maximum number of seconds between log syncs
+
+	def __init__(self, name=None):
+		self._name = name or uuid.uuid4().hex
+		self._lock = Lock()
+		self._plan = None
+		self._log = None
+		self._unsynced = 0
+		self._sync_time = 0
+
+		self._done = set()
+		self._skipped = set()
+		self._offsets = {}
+		self._stages = set()
+
+		directory = self.get_directory()
+		self._plan_file = os.path.join(directory, '{0}.json'.format(self._name))
+		self._log_file = os.path.join(directory, '{0}.log'.format(self._name))
+
+	@classmethod
+	def get_directory(cls):
+		"""Return path to directory containing journals."""
+		return os.path.join(get_cache_directory(), cls.directory_name)
+
+	@classmethod
+	def get_unfinished(cls):
+		"""Return list of locked journals left behind by interrupted operations."""
+		result = []
+		directory = cls.get_directory()
+
+		if not os.path.isdir(directory):
+			return result
+
+		for file_name in sorted(os.listdir(directory)):
+			name, extension = os.path.splitext(file_name)
+			if extension != '.json':
+				continue
+
+			journal = cls(name)
+
+			# operation is still running in other instance or journal is damaged
+			if not journal.open():
+				continue
+
+			result.append(journal)
+
+		return result
+
+	def __lock_log(self):
+		"""Open log for appending and lock it. Returns False if log is already locked."""
+		self._log = open(self._log_file, 'a')
+
+		try:
+			fcntl.flock(self._log.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+		except (IOError, OSError):
+			self._log.close()
+			self._log = None
+			return False
+
+		return True
+
+	def __write_entry(self, entry, sync=False):
+		"""Append entry to log. Log is synced to disk only once enough entries
+		were written or time has passed since the last sync, losing some of the
+		entries only means those files are copied again."""
+		with self._lock:
+			if self._log is None:
+				return
+
+			self._log.write(json.dumps(entry) + '\n')
+			self._unsynced += 1
+
+			if sync \
+			or self._unsynced >= self.sync_count \
+			or time.monotonic() - self._sync_time >= self.sync_interval:
+				self.__sync()
+
+	def __sync(self):
+		"""Make sure written entries reach the disk."""
+		self._log.flush()
+		os.fsync(self._log.fileno())
+
+		self._unsynced = 0
+		self._sync_time = time.monotonic()
+
+	def create(self, plan):
+		"""Store operation plan and start new log."""
+		directory = self.get_directory()
+		if not os.path.isdir(directory):
+			os.makedirs(directory)
+
+		if not self.__lock_log():
+			raise OSError('Unable to lock operation journal.')
+
+		# write plan under temporary name so incomplete plan is never loaded
+		temporary_file = self._plan_file + '.tmp'
+		with open(temporary_file, 'w') as raw_file:
+			json.dump(plan, raw_file)
+			raw_file.flush()
+			os.fsync(raw_file.fileno())
+
+		os.replace(temporary_file, self._plan_file)
+		self._plan = plan
+
+	def open(self):
+		"""Lock and load existing journal. Returns False if journal can't be used."""
+		try:
+			if not self.__lock_log():
+				return False
+
+			with open(self._plan_file, 'r') as raw_file:
+				self._plan = json.load(raw_file)
+
+			with open(self._log_file, 'r') as raw_file:
+				lines = raw_file.readlines()
+
+		except (IOError, OSError, ValueError):
+			self.close()
+			return False
+
+		for line in lines:
+			try:
+				entry = json.loads(line)
+
+			except ValueError:
+				# last line could be incomplete if application was killed while writing
+				continue
+
+			if entry[0] == JournalEntry.STAGE:
+				self._stages.add(entry[1])
+				continue
+
+			item = tuple(entry[1])
+
+			if entry[0] == JournalEntry.DONE:
+				self._done.add(item)
+				self._offsets.pop(item, None)
+
+			elif entry[0] == JournalEntry.SKIPPED:
+				self._skipped.add(item)
+				self._offsets.pop(item, None)
+
+			elif entry[0] == JournalEntry.OFFSET:
+				self._offsets[item] = (entry[2], entry[3])
+
+		return True
+
+	def close(self):
+		"""Release journal leaving it on disk so operation can be resumed later."""
+		with self._lock:
+			if self._log is not None:
+				if self._unsynced:
+					self.__sync()
+
+				self._log.close()
+				self._log = None
+
+	def remove(self):
+		"""Remove journal once operation is finished or user doesn't want to resume it."""
+		for file_name in (self._plan_file, self._log_file):
+			try:
+				os.remove(file_name)
+
+			except OSError:
+				pass
+
+		self.close()
+
+	def get_plan(self):
+		"""Return stored operation plan."""
+		return self._plan
+
+	def is_done(self, item):
+		"""Check if file was completely copied."""
+		return item in self._done
+
+	def is_skipped(self, item):
+		"""Check if user chose not to copy file."""
+		return item in self._skipped
+
+	def is_stage_done(self, stage):
+		"""Check if specified stage of operation was completed."""
+		return stage in self._stages
+
+	def get_partial(self, item):
+		"""Return tuple with destination name and last recorded offset of partially
+		copied file or None if file copying wasn't started."""
+		return self._offsets.get(item)
+
+	def set_done(self, item):
+		"""Record file as completely copied."""
+		self._done.add(item)
+		self._offsets.pop(item, None)
+		self.__write_entry((JournalEntry.DONE, item))
+
+	def set_skipped(self, item):
+		"""Record file as skipped by user."""
+		self._skipped.add(item)
+		self._offsets.pop(item, None)
+		self.__write_entry((JournalEntry.SKIPPED, item))
+
+	def set_stage_done(self, stage):
+		"""Record stage of operation as completed."""
+		self._stages.add(stage)
+		self.__write_entry((JournalEntry.STAGE, stage), sync=True)
+
+	def set_offset(self, item, destination, handle, offset, force=False):
+		"""Record offset up to which destination file was written. Offsets are
+		recorded only after enough data was written since the last one and
+		only once data before them has reached the disk."""
+		partial = self._offsets.get(item)
+		last_offset = partial[1] if partial is not None else 0
+
+		if not force and offset - last_offset < self.offset_interval:
+			return
+
+		if offset > 0:
+			handle.flush()
+
+			# remote files don't have descriptors and are synced by their provider
+			try:
+				os.fsync(handle.fileno())
+
+			except (AttributeError, OSError, ValueError):
+				pass
+
+		self._offsets[item] = (destination, offset)
+		self.__write_entry((JournalEntry.OFFSET, item, destination, offset), sync=True)
@@ -204,6 +204,7 @@ class ItemList(PluginBase):
 		group.add_method('open_in_new_tab', _('Open selected directory in new tab'), self._open_in_new_tab)
 		group.add_method('open_directory', _('Open selected directory'), self._open_directory)
 		group.add_method('calculate_disk_usage', _('Calculate disk usage for directory'), self._calculate_disk_usage)
+		group.add_method('generate_thumbnails', _('Generate thumbnails for selected items'), self._generate_thumbnails)
 		group.add_method('create_terminal', _('Create terminal tab'), self._create_terminal)
 		group.add_method('parent_directory', _('Go to parent directory'), self._parent_directory)
 		group.add_method('root_directory', _('Go to root directory'), self._root_directory)
@@ -805,6 +806,10 @@ class ItemList(PluginBase):
 		"""Start calculation of disk usage by the selected directory."""
 		return True
 
+	def _generate_thumbnails(self, widget=None, data=None):
+		"""Start generating thumbnails for selected items."""
+		return True
+
 	def _expand_directory(self, widget=None, data=None):
 		"""Expand currently selected directory"""
 		return True
@@ -1190,10 +1195,15 @@ class ItemList(PluginBase):
 		self._parent.preferences_window.show(widget, 'bookmarks')
 		return True
 
-	def _directory_changed(self, event, path, other_path, parent=None):
+	def _directory_changed(self, monitor, event, path, other_path, parent=None):
 		"""Handle signal emitted by monitor"""
 		pass
 
+	def _directory_changed_batch(self, monitor, events, parent=None):
+		"""Handle list of events collected by monitor during single interval"""
+		for event, path, other_path in events:
+			self._directory_changed(monitor, event, path, other_path, parent)
+
 	def change_path(self, path=None, selected=None):
 		"""Public method for safe path change """
 		real_path = os.path.expanduser(path)
@@ -1414,7 +1424,7 @@ class ItemList(PluginBase):
 			# create new monitor for specified path
 			provider = self.get_provider()
 			monitor = provider.get_monitor(path)
-			monitor.connect('changed', self._directory_changed, parent)
+			monitor.connect('changed-batch', self._directory_changed_batch, parent)
 
 			# add monitor to the list
 			self._monitor_list.append(monitor)
@@ -1,5 +1,6 @@
 from __future__ import absolute_import
 
+from collections import OrderedDict
 from gi.repository import GObject
 from queue import Queue, Empty as QueueEmptyException
 from threading import Event
@@ -33,11 +34,17 @@ class Monitor(GObject.GObject):
 	This monitor class also provides custom event queue which can be
 	used to manually emit signals.
 
+	Events collected during single interval are emitted together through
+	`changed-batch` signal as a list of (signal, path, other_path) tuples
+	when it has handlers connected, otherwise `changed` is emitted for
+	each of them.
+
 	"""
 
 	__gtype_name__ = 'Sunflower_Monitor'
 	__gsignals__ = {
 				'changed': (GObject.SignalFlags.RUN_LAST, None, (int, GObject.TYPE_PYOBJECT, GObject.TYPE_PYOBJECT)),
+				'changed-batch': (GObject.SignalFlags.RUN_LAST, None, (GObject.TYPE_PYOBJECT,)),
 			}
 
 	TIMEOUT = 1000
@@ -74,9 +81,16 @@ class Monitor(GObject.GObject):
 				# no more events in the queue
 				break
 
-		# emit events from a set
-		for event in set(events):
-			self._emit_signal(*event)
+		# remove duplicate events keeping the last occurrence so final state is applied
+		events = list(reversed(OrderedDict.fromkeys(reversed(events))))
+
+		# emit all events at once when possible
+		if len(events) > 0 and self._has_batch_handler():
+			self._emit_batch(events)
+
+		else:
+			for event in events:
+				self._emit_signal(*event)
 
 		# if paused break interval cycle
 		return not self._paused.isSet()
@@ -92,6 +106,19 @@ class Monitor(GObject.GObject):
 		if not self._paused.is_set():
 			self.emit('changed', signal, path, other_path)
 
+	def _has_batch_handler(self):
+		"""Check if there are handlers connected to batch signal"""
+		signal_id = GObject.signal_lookup('changed-batch', Monitor)
+		return GObject.signal_has_handler_pending(self, signal_id, 0, False)
+
+	def _emit_batch(self, events):
+		"""Notify connected objects about all the changes collected during single
+		interval. Events are provided as list of (signal, path, other_path) tuples.
+
+		"""
+		if not self._paused.is_set():
+			self.emit('changed-batch', events)
+
 	def is_manual(self):
 		"""Check if monitor solely relies on queues"""
 		return True
@@ -1,8 +1,11 @@
 from __future__ import absolute_import
 
 import os
+import time
+import errno
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+from threading import Lock
 from sunflower.plugin_base.monitor import Monitor
 
 
@@ -38,6 +41,15 @@ FileInfoExtended = namedtuple(
 				])
 
 
+DirectoryEntry = namedtuple(
+				'DirectoryEntry',
+				[
+					'name',  # item name
+					'info',  # FileInfo object, symbolic links are followed
+					'is_link',  # true if item is a symbolic link
+				])
+
+
 SystemSize = namedtuple(
 				'SystemSize',
 				[
@@ -69,6 +81,7 @@ class Support:
 	SET_ACCESS = 6
 	SET_TIMESTAMP = 7
 	SYSTEM_SIZE = 8
+	CLONE = 9
 
 
 class Mode:
@@ -81,6 +94,66 @@ class Mode:
 class TrashError(Exception): pass
 
 
+class ListingCache:
+	"""Thread safe cache of recently listed directories.
+
+	Each listing is stored along with value identifying state of the directory
+	at the time of listing and time it was stored. Least recently used listings
+	are discarded once cache is full.
+
+	"""
+
+	def __init__(self, size, entry_limit):
+		self._size = size
+		self._entry_limit = entry_limit
+		self._entry_count = 0
+		self._items = OrderedDict()
+		self._lock = Lock()
+
+	def get(self, path):
+		"""Return tuple containing validator, time and listing for specified path or None."""
+		with self._lock:
+			result = self._items.get(path)
+
+			if result is not None:
+				self._items.move_to_end(path)
+
+		return result
+
+	def set(self, path, validator, listing):
+		"""Store directory listing for specified path."""
+		with self._lock:
+			self._remove(path)
+
+			# listings over the limit on their own are not worth keeping in memory
+			if len(listing) > self._entry_limit:
+				return
+
+			self._items[path] = (validator, time.time(), listing)
+			self._entry_count += len(listing)
+
+			# keep number of listings and total number of entries within limits
+			while len(self._items) > self._size or self._entry_count > self._entry_limit:
+				self._remove(next(iter(self._items)))
+
+	def _remove(self, path):
+		"""Remove listing for specified path while holding the lock."""
+		cached = self._items.pop(path, None)
+
+		if cached is not None:
+			self._entry_count -= len(cached[2])
+
+	def remove(self, path=None):
+		"""Remove listing for specified path or all listings when path is omitted."""
+		with self._lock:
+			if path is None:
+				self._items.clear()
+				self._entry_count = 0
+
+			else:
+				self._remove(path)
+
+
 class Provider:
 	"""Abstract provider class used to manipulate items"""
 
@@ -88,6 +161,13 @@ class Provider:
 	protocol = None  # name of supported protocol
 	archives = ()  # list of supported archive types
 
+	listing_cache_size = 16  # number of directory listings kept in cache
+	listing_cache_entries = 200000  # total number of directory entries kept in cache
+	listing_cache_ttl = None  # seconds listing is valid for when directory state can't be checked
+
+	_listing_caches = {}
+	_listing_caches_lock = Lock()
+
 	def __init__(self, parent, path=None, selection=None):
 		self._parent = parent
 
@@ -165,6 +245,12 @@ class Provider:
 		"""Open path in specified mode and return its handle"""
 		pass
 
+	def clone_file(self, source_handle, destination_handle):
+		"""Make destination file share data with source file without copying it.
+		Both handles need to be opened by this provider. Raises OSError when
+		file system doesn't allow cloning."""
+		raise OSError(errno.EOPNOTSUPP, os.strerror(errno.EOPNOTSUPP))
+
 	def get_stat(self, path, relative_to=None, extended=False, follow=False):
 		"""Return file statistics.
 
@@ -246,6 +332,87 @@ class Provider:
 		"""Return parent list"""
 		return self._parent
 
+	def list_dir_with_stat(self, path, relative_to=None):
+		"""Get directory list along with statistics for each item.
+
+		Returns list of DirectoryEntry objects. Information for symbolic links
+		is taken from their targets while `is_link` is set to denote the link
+		itself. Providers capable of listing directory and getting statistics
+		in a single pass should override this method.
+
+		"""
+		result = []
+		real_path = self.real_path(path, relative_to)
+
+		for name in self.list_dir(path, relative_to):
+			file_info = self.get_stat(name, relative_to=real_path)
+			is_link = file_info.type is FileType.LINK
+
+			# retrieve real information for links
+			if is_link:
+				file_info = self.get_stat(name, relative_to=real_path, follow=True)
+
+			result.append(DirectoryEntry(name, file_info, is_link))
+
+		return result
+
+	def _get_listing_cache(self):
+		"""Return listing cache shared by all instances of this provider class."""
+		with Provider._listing_caches_lock:
+			result = Provider._listing_caches.get(self.__class__)
+
+			if result is None:
+				result = ListingCache(self.listing_cache_size, self.listing_cache_entries)
+				Provider._listing_caches[self.__class__] = result
+
+		return result
+
+	def get_directory_validator(self, path, relative_to=None):
+		"""Return value which changes whenever content of directory changes.
+
+		Providers which can't cheaply determine this should return None in
+		which case cached listings are only valid for `listing_cache_ttl`.
+
+		"""
+		return None
+
+	def get_cached_listing(self, path, relative_to=None):
+		"""Return cached result of `list_dir_with_stat` for specified path or
+		None if directory was not listed recently or it has changed since."""
+		real_path = self.real_path(path, relative_to)
+		cached = self._get_listing_cache().get(real_path)
+
+		if cached is None:
+			return None
+
+		validator, timestamp, listing = cached
+
+		if validator is not None:
+			is_valid = validator == self.get_directory_validator(real_path)
+
+		else:
+			is_valid = self.listing_cache_ttl is not None \
+					and time.time() - timestamp < self.listing_cache_ttl
+
+		return listing if is_valid else None
+
+	def cache_listing(self, path, listing, relative_to=None):
+		"""Store result of `list_dir_with_stat` for specified path in cache."""
+		real_path = self.real_path(path, relative_to)
+
+		# avoid checking directory state for listings too large to be stored
+		if len(listing) > self.listing_cache_entries:
+			self._get_listing_cache().remove(real_path)
+			return
+
+		validator = self.get_directory_validator(real_path)
+
+		# listings which can't be validated in any way are not stored
+		if validator is None and self.listing_cache_ttl is None:
+			return
+
+		self._get_listing_cache().set(real_path, validator, listing)
+
 	def get_root_path(self, path):
 		"""Get root for specified path"""
 		pass
@@ -0,0 +1,20 @@
+class Column:
+	NAME = 0
+	FORMATTED_NAME = 1
+	EXTENSION = 2
+	SIZE = 3
+	FORMATTED_SIZE = 4
+	MODE = 5
+	FORMATTED_MODE = 6
+	TIME = 7
+	FORMATTED_TIME = 8
+	IS_DIR = 9
+	IS_PARENT_DIR = 10
+	IS_LINK = 11
+	COLOR = 12
+	ICON = 13
+	SELECTED = 14
+	USER_ID = 15
+	GROUP_ID = 16
+	EMBLEMS = 17
+	SORT_DATA = 18
@@ -0,0 +1,566 @@
+from __future__ import absolute_import
+
+from array import array
+from gi.repository import GObject, GLib, Gtk
+
+from .column import Column
+
+
+class Flag:
+	IS_DIR = 1
+	IS_PARENT_DIR = 2
+	IS_LINK = 4
+	SELECTED = 8
+
+
+class CompactListModel(GObject.GObject, Gtk.TreeModel):
+	"""Flat list model storing items in compact column arrays.
+
+	Instead of keeping all columns for each row, only raw values are stored
+	in typed arrays while formatted values are generated on demand when the
+	list asks for them, which is usually only for visible rows. Model exposes
+	the same columns and the subset of `Gtk.TreeStore` methods used by file
+	list so code working with the store doesn't need to distinguish between
+	the two. Nested items are not supported.
+
+	Parent object is expected to provide `_format_name`, `_format_size`,
+	`_format_mode` and `_format_time` methods used for formatting values.
+
+	"""
+
+	__gtype_name__ = 'Sunflower_CompactListModel'
+
+	column_types = (
+			GObject.TYPE_PYOBJECT,  # Column.NAME
+			GObject.TYPE_STRING,  # Column.FORMATTED_NAME
+			GObject.TYPE_STRING,  # Column.EXTENSION
+			GObject.TYPE_DOUBLE,  # Column.SIZE
+			GObject.TYPE_STRING,  # Column.FORMATTED_SIZE
+			GObject.TYPE_INT,  # Column.MODE
+			GObject.TYPE_STRING,  # Column.FORMATTED_MODE
+			GObject.TYPE_INT,  # Column.TIME
+			GObject.TYPE_STRING,  # Column.FORMATTED_TIME
+			GObject.TYPE_BOOLEAN,  # Column.IS_DIR
+			GObject.TYPE_BOOLEAN,  # Column.IS_PARENT_DIR
+			GObject.TYPE_BOOLEAN,  # Column.IS_LINK
+			GObject.TYPE_STRING,  # Column.COLOR
+			GObject.TYPE_STRING,  # Column.ICON
+			GObject.TYPE_BOOLEAN,  # Column.SELECTED
+			GObject.TYPE_INT64,  # Column.USER_ID
+			GObject.TYPE_INT64,  # Column.GROUP_ID
+			GObject.TYPE_PYOBJECT,  # Column.EMBLEMS
+			GObject.TYPE_PYOBJECT,  # Column.SORT_DATA
+		)
+
+	# columns stored as bits in flags array
+	flag_columns = {
+			Column.IS_DIR: Flag.IS_DIR,
+			Column.IS_PARENT_DIR: Flag.IS_PARENT_DIR,
+			Column.IS_LINK: Flag.IS_LINK,
+			Column.SELECTED: Flag.SELECTED,
+		}
+
+	# columns taken from rows when appending, formatted values are ignored
+	stored_columns = (
+			Column.NAME,
+			Column.SIZE,
+			Column.MODE,
+			Column.TIME,
+			Column.IS_DIR,
+			Column.IS_PARENT_DIR,
+			Column.IS_LINK,
+			Column.COLOR,
+			Column.ICON,
+			Column.SELECTED,
+			Column.USER_ID,
+			Column.GROUP_ID,
+			Column.EMBLEMS,
+			Column.SORT_DATA,
+		)
+
+	# formatted columns which get reset when their raw value changes
+	formatted_columns = {
+			Column.SIZE: Column.FORMATTED_SIZE,
+			Column.MODE: Column.FORMATTED_MODE,
+			Column.TIME: Column.FORMATTED_TIME,
+		}
+
+	def __init__(self, parent):
+		GObject.GObject.__init__(self)
+
+		self._parent = parent
+		self._stamp = 1
+
+		# sort configuration
+		self._sort_column = None
+		self._sort_descending = False
+		self._sort_pending = False
+
+		self._reset_storage()
+
+	def _reset_storage(self):
+		"""Create empty storage arrays."""
+		# row values indexed by slot
+		self._names = []
+		self._icons = []
+		self._sort_data = []
+		self._sizes = array('d')
+		self._modes = array('i')
+		self._times = array('d')
+		self._user_ids = array('q')
+		self._group_ids = array('q')
+		self._flags = array('B')
+
+		# rarely set values like colors, emblems and overridden formatting
+		self._extra = {}
+
+		# slots of removed rows available for reuse
+		self._free_slots = []
+
+		# slots indexed by item name for fast lookup
+		self._slots_by_name = {}
+
+		# slots in display order
+		self._order = array('l')
+
+		# positions of slots, only first `_valid_positions` are up to date
+		self._positions = {}
+		self._valid_positions = 0
+
+	def _allocate_slot(self):
+		"""Return slot with default values ready to be filled."""
+		if len(self._free_slots) > 0:
+			result = self._free_slots.pop()
+
+			self._names[result] = None
+			self._icons[result] = None
+			self._sort_data[result] = None
+			self._sizes[result] = 0
+			self._modes[result] = 0
+			self._times[result] = 0
+			self._user_ids[result] = 0
+			self._group_ids[result] = 0
+			self._flags[result] = 0
+
+		else:
+			result = len(self._names)
+
+			self._names.append(None)
+			self._icons.append(None)
+			self._sort_data.append(None)
+			self._sizes.append(0)
+			self._modes.append(0)
+			self._times.append(0)
+			self._user_ids.append(0)
+			self._group_ids.append(0)
+			self._flags.append(0)
+
+		return result
+
+	def _release_slot(self, slot):
+		"""Mark slot as free and release objects it holds."""
+		self._slots_by_name.pop(self._names[slot], None)
+		self._positions.pop(slot, None)
+		self._names[slot] = None
+		self._icons[slot] = None
+		self._sort_data[slot] = None
+		self._extra.pop(slot, None)
+		self._free_slots.append(slot)
+
+	def _create_iter(self, position):
+		"""Create iter pointing to specified position."""
+		result = Gtk.TreeIter()
+		result.stamp = self._stamp
+		result.user_data = position + 1  # avoid storing null pointer
+
+		return result
+
+	def _get_position(self, tree_iter):
+		"""Return position iter is pointing to."""
+		return tree_iter.user_data - 1
+
+	def _invalidate_positions(self, position):
+		"""Mark positions of slots starting with specified one as outdated."""
+		self._valid_positions = min(self._valid_positions, position)
+
+	def _get_slot_position(self, slot):
+		"""Return position of specified slot in display order.
+
+		Rows before changed position keep their place, so only positions after
+		the first change since last lookup need to be updated.
+
+		"""
+		result = self._positions.get(slot)
+
+		if result is None or result >= self._valid_positions:
+			positions = self._positions
+			order = self._order
+
+			for position in range(self._valid_positions, len(order)):
+				positions[order[position]] = position
+
+			self._valid_positions = len(order)
+			result = positions[slot]
+
+		return result
+
+	def _get_column_value(self, slot, column):
+		"""Return value of specified column for slot."""
+		flags = self._flags[slot]
+
+		if column == Column.NAME:
+			return self._names[slot]
+
+		if column in self.flag_columns:
+			return bool(flags & self.flag_columns[column])
+
+		# values explicitly set take precedence
+		extra = self._extra.get(slot)
+		if extra is not None and column in extra:
+			return extra[column]
+
+		is_dir = bool(flags & Flag.IS_DIR)
+		is_parent = bool(flags & Flag.IS_PARENT_DIR)
+
+		if column in (Column.FORMATTED_NAME, Column.EXTENSION):
+			if is_parent:
+				result = (self._names[slot], '')
+			else:
+				result = self._parent._format_name(self._names[slot], is_dir)
+
+			return result[column == Column.EXTENSION]
+
+		elif column == Column.SIZE:
+			return self._sizes[slot]
+
+		elif column == Column.FORMATTED_SIZE:
+			return self._parent._format_size(self._sizes[slot], is_dir)
+
+		elif column == Column.MODE:
+			return self._modes[slot]
+
+		elif column == Column.FORMATTED_MODE:
+			return self._parent._format_mode(self._modes[slot]) if not is_parent else ''
+
+		elif column == Column.TIME:
+			return int(self._times[slot])
+
+		elif column == Column.FORMATTED_TIME:
+			return self._parent._format_time(self._times[slot]) if not is_parent else ''
+
+		elif column == Column.ICON:
+			return self._icons[slot]
+
+		elif column == Column.USER_ID:
+			return self._user_ids[slot]
+
+		elif column == Column.GROUP_ID:
+			return self._group_ids[slot]
+
+		elif column == Column.SORT_DATA:
+			return self._sort_data[slot]
+
+		return None
+
+	def _set_column_value(self, slot, column, value):
+		"""Store value of specified column for slot."""
+		if column == Column.NAME:
+			if self._slots_by_name.get(self._names[slot]) == slot:
+				del self._slots_by_name[self._names[slot]]
+
+			self._names[slot] = value
+			self._slots_by_name[value] = slot
+
+		elif column in self.flag_columns:
+			if value:
+				self._flags[slot] |= self.flag_columns[column]
+			else:
+				self._flags[slot] &= ~self.flag_columns[column] & 0xff
+
+		elif column == Column.SIZE:
+			self._sizes[slot] = value
+
+		elif column == Column.MODE:
+			self._modes[slot] = value
+
+		elif column == Column.TIME:
+			self._times[slot] = value
+
+		elif column == Column.ICON:
+			self._icons[slot] = value
+
+		elif column == Column.USER_ID:
+			self._user_ids[slot] = value
+
+		elif column == Column.GROUP_ID:
+			self._group_ids[slot] = value
+
+		elif column == Column.SORT_DATA:
+			self._sort_data[slot] = value
+
+		elif value is not None:
+			# colors, emblems and formatting overrides
+			self._extra.setdefault(slot, {})[column] = value
+
+		elif slot in self._extra:
+			self._extra[slot].pop(column, None)
+
+		# reset formatting override when raw value changes
+		if column in self.formatted_columns and slot in self._extra:
+			self._extra[slot].pop(self.formatted_columns[column], None)
+
+	def _get_sort_key(self, slot):
+		"""Return value used for sorting specified slot."""
+		return self._get_column_value(slot, self._sort_column)
+
+	def _find_position(self, slot):
+		"""Find position at which slot should be inserted to keep list sorted."""
+		if self._sort_column is None:
+			return len(self._order)
+
+		key = self._get_sort_key(slot)
+		low = 0
+		high = len(self._order)
+
+		while low < high:
+			middle = (low + high) // 2
+			middle_key = self._get_sort_key(self._order[middle])
+
+			if self._sort_descending:
+				before = key > middle_key
+			else:
+				before = key < middle_key
+
+			if before:
+				high = middle
+			else:
+				low = middle + 1
+
+		return low
+
+	def _schedule_sort(self):
+		"""Schedule sorting of the list once current changes are done."""
+		if self._sort_pending:
+			return
+
+		self._sort_pending = True
+		GLib.idle_add(self._sort)
+
+	def _sort(self):
+		"""Sort rows and notify views about new order."""
+		self._sort_pending = False
+
+		if self._sort_column is None or len(self._order) < 2:
+			return False
+
+		new_order = sorted(
+				range(len(self._order)),
+				key=lambda position: self._get_sort_key(self._order[position]),
+				reverse=self._sort_descending
+			)
+
+		# nothing has changed
+		if all(position == index for index, position in enumerate(new_order)):
+			return False
+
+		self._order = array('l', (self._order[position] for position in new_order))
+		self._invalidate_positions(0)
+		self.rows_reordered(Gtk.TreePath(), None, new_order)
+
+		return False
+
+	def append(self, parent, row=None):
+		"""Add new row to the list and return iter pointing to it."""
+		slot = self._allocate_slot()
+
+		if row is not None:
+			for column in self.stored_columns:
+				self._set_column_value(slot, column, row[column])
+
+		# insert slot to its sorted position
+		position = self._find_position(slot)
+		self._order.insert(position, slot)
+		self._invalidate_positions(position)
+
+		# notify views
+		result = self._create_iter(position)
+		self.row_inserted(Gtk.TreePath((position,)), result)
+
+		return result
+
+	def remove(self, tree_iter):
+		"""Remove row from the list.
+
+		Since iters are pointing to positions in the list, after removal
+		specified iter points to the next row. Return value denotes whether
+		iter is still valid.
+
+		"""
+		position = self._get_position(tree_iter)
+		slot = self._order.pop(position)
+		self._invalidate_positions(position)
+		self._release_slot(slot)
+
+		self.row_deleted(Gtk.TreePath((position,)))
+
+		return position < len(self._order)
+
+	def clear(self):
+		"""Remove all rows from the list."""
+		for position in reversed(range(len(self._order))):
+			self._order.pop()
+			self.row_deleted(Gtk.TreePath((position,)))
+
+		self._reset_storage()
+
+	def set_value(self, tree_iter, column, value):
+		"""Set value of column for row iter is pointing to."""
+		position = self._get_position(tree_iter)
+		self._set_column_value(self._order[position], column, value)
+
+		self.row_changed(Gtk.TreePath((position,)), tree_iter)
+
+		# keep list sorted
+		if column == self._sort_column:
+			self._schedule_sort()
+
+	def get_value(self, tree_iter, column):
+		"""Get value of column for row iter is pointing to."""
+		return self._get_column_value(self._order[self._get_position(tree_iter)], column)
+
+	def set_sort_column_id(self, column, order):
+		"""Set column list is sorted by."""
+		if column < 0:
+			# unsorted or default sort column
+			self._sort_column = None
+			return
+
+		self._sort_column = column
+		self._sort_descending = order == Gtk.SortType.DESCENDING
+		self._sort()
+
+	def get_sort_column_id(self):
+		"""Return column and order list is sorted by."""
+		order = (Gtk.SortType.ASCENDING, Gtk.SortType.DESCENDING)[self._sort_descending]
+		return self._sort_column, order
+
+	def find_iter(self, name):
+		"""Return iter pointing to row with specified name or None."""
+		slot = self._slots_by_name.get(name)
+
+		if slot is None:
+			return None
+
+		return self._create_iter(self._get_slot_position(slot))
+
+	def get_iter_first(self):
+		"""Return iter pointing to first row."""
+		return self._create_iter(0) if len(self._order) > 0 else None
+
+	def get_iter(self, path):
+		"""Return iter pointing to specified path."""
+		if isinstance(path, Gtk.TreePath):
+			indices = path.get_indices()
+
+		elif isinstance(path, int):
+			indices = (path,)
+
+		elif isinstance(path, str):
+			indices = tuple(int(index) for index in path.split(':'))
+
+		else:
+			indices = tuple(path)
+
+		if len(indices) != 1 or not 0 <= indices[0] < len(self._order):
+			raise ValueError('invalid tree path \'{0}\''.format(path))
+
+		return self._create_iter(indices[0])
+
+	def get_path(self, tree_iter):
+		"""Return path for specified iter."""
+		if tree_iter is None or not tree_iter.user_data:
+			raise TypeError('Invalid tree iter.')
+
+		return Gtk.TreePath((self._get_position(tree_iter),))
+
+	def iter_next(self, tree_iter):
+		"""Return iter pointing to the next row."""
+		position = self._get_position(tree_iter) + 1
+		return self._create_iter(position) if position < len(self._order) else None
+
+	def iter_has_child(self, tree_iter):
+		"""Rows never have children."""
+		return False
+
+	def iter_children(self, tree_iter):
+		"""Return first row for top level or None."""
+		return self.get_iter_first() if tree_iter is None else None
+
+	def iter_parent(self, tree_iter):
+		"""Rows never have parent."""
+		return None
+
+	def __len__(self):
+		return len(self._order)
+
+	def do_get_flags(self):
+		return Gtk.TreeModelFlags.LIST_ONLY
+
+	def do_get_n_columns(self):
+		return len(self.column_types)
+
+	def do_get_column_type(self, column):
+		return self.column_types[column]
+
+	def do_get_iter(self, path):
+		indices = path.get_indices()
+
+		if len(indices) == 1 and 0 <= indices[0] < len(self._order):
+			return True, self._create_iter(indices[0])
+
+		return False, None
+
+	def do_get_path(self, tree_iter):
+		return self.get_path(tree_iter)
+
+	def do_get_value(self, tree_iter, column):
+		return self.get_value(tree_iter, column)
+
+	def do_iter_next(self, tree_iter):
+		position = self._get_position(tree_iter) + 1
+
+		if position < len(self._order):
+			tree_iter.user_data = position + 1
+			return True
+
+		return False
+
+	def do_iter_previous(self, tree_iter):
+		position = self._get_position(tree_iter) - 1
+
+		if position >= 0:
+			tree_iter.user_data = position + 1
+			return True
+
+		return False
+
+	def do_iter_children(self, parent):
+		if parent is None and len(self._order) > 0:
+			return True, self._create_iter(0)
+
+		return False, None
+
+	def do_iter_has_child(self, tree_iter):
+		return False
+
+	def do_iter_n_children(self, tree_iter):
+		return len(self._order) if tree_iter is None else 0
+
+	def do_iter_nth_child(self, parent, index):
+		if parent is None and 0 <= index < len(self._order):
+			return True, self._create_iter(index)
+
+		return False, None
+
+	def do_iter_parent(self, child):
+		return False, None
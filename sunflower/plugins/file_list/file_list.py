@@ -3,20 +3,25 @@ from __future__ import absolute_import
 import os
 import re
 import time
+import heapq
 import sys
 import fnmatch
 
 from gi.repository import GObject, Gtk, Gdk, GLib, Gio
-from threading import Thread, Event
+from queue import Queue, Empty as QueueEmptyException, Full as QueueFullException
+from threading import Thread, Lock
 
+from .column import Column
 from .column_editor import FileList_ColumnEditor
+from .compact_model import CompactListModel
+from .formatter import ItemFormatter
 
 from sunflower import common
 from sunflower.gui.input_dialog import ApplicationSelectDialog
 from sunflower.gui.input_dialog import CopyDialog, MoveDialog, RenameDialog, DeleteDialog
 from sunflower.gui.input_dialog import FileCreateDialog, DirectoryCreateDialog, LinkDialog
 from sunflower.gui.properties_window import PropertiesWindow
-from sunflower.operation import DeleteOperation, CopyOperation, MoveOperation
+from sunflower.operation import DeleteOperation, CopyOperation, MoveOperation, ThumbnailOperation
 from sunflower.parameters import Parameters
 from sunflower.plugin_base.item_list import ItemList
 from sunflower.plugin_base.monitor import MonitorSignals, MonitorError
@@ -25,28 +30,6 @@ from sunflower.widgets.thumbnail_view import ThumbnailView
 from sunflower.widgets.emblems_renderer import CellRendererEmblems
 
 
-class Column:
-	NAME = 0
-	FORMATTED_NAME = 1
-	EXTENSION = 2
-	SIZE = 3
-	FORMATTED_SIZE = 4
-	MODE = 5
-	FORMATTED_MODE = 6
-	TIME = 7
-	FORMATTED_TIME = 8
-	IS_DIR = 9
-	IS_PARENT_DIR = 10
-	IS_LINK = 11
-	COLOR = 12
-	ICON = 13
-	SELECTED = 14
-	USER_ID = 15
-	GROUP_ID = 16
-	EMBLEMS = 17
-	SORT_DATA = 18
-
-
 class FileList(ItemList):
 	"""General file list plugin
 
@@ -58,6 +41,11 @@ class FileList(ItemList):
 	column_editor = None
 	number_split = re.compile('([0-9]+)')
 
+	load_queue_size = 2000  # maximum number of rows loader can get ahead of the list
+	frame_budget = 0.008  # seconds main thread spends adding rows before handling other events
+	first_batch_size = 200  # rows shown before the rest of directory is created and sorted
+	prefetch_delay = 300  # milliseconds cursor needs to stay on item before it's prefetched
+
 	def __init__(self, parent, notebook, options):
 		ItemList.__init__(self, parent, notebook, options)
 
@@ -68,38 +56,58 @@ class FileList(ItemList):
 
 		section = self._parent.options.section('item_list')
 		self._always_visible_items = section.get('always_visible')
+		self._prefetch_directories = section.get('prefetch_directories')
+		self._prefetch_timeout = None
 
-		# event object controlling path change thread
-		self._thread_active = Event()
-		self._main_thread_lock = Event()
+		# each load gets new generation, results of older loader threads are discarded
+		self._load_generation = 0
+		self._loading = False
 
 		self._item_queue = []
 		self._emblem_cache = {}
 
+		# rows and actions produced by loader thread, consumed in main thread
+		self._load_queue = Queue(maxsize=self.load_queue_size)
+		self._load_queue_lock = Lock()
+		self._load_queue_scheduled = False
+
+		# iters indexed by item name, tree store iters remain valid until removed
+		self._item_index = {}
+
 		# storage system for list items
-		self._store = Gtk.TreeStore(
-								# name is a string, but it can contain surrogates,
-								# so it can't be marshalled as a gstring.
-								GObject.TYPE_PYOBJECT,	# Column.NAME
-								str,	# Column.FORMATTED_NAME
-								str,	# Column.EXTENSION
-								float,	# Column.SIZE
-								str,	# Column.FORMATTED_SIZE
-								int,	# Column.MODE
-								str,	# Column.FORMATTED_MODE
-								int,	# Column.DATE
-								str,	# Column.FORMATTED_DATE
-								bool,	# Column.IS_DIR
-								bool,	# Column.IS_PARENT_DIR
-								bool,	# Column.IS_LINK
-								str,	# Column.COLOR
-								str,	# Column.ICON
-								bool,	# Column.SELECTED
-								GObject.TYPE_INT64,	# Column.USER_ID
-								GObject.TYPE_INT64,	# Column.GROUP_ID
-								GObject.TYPE_PYOBJECT,	# Column.EMBLEMS
-								str		# Column.SORT_DATA
-							)
+		self._compact_model = section.get('compact_model')
+
+		if self._compact_model:
+			# array backed model which formats values on demand
+			self._store = CompactListModel(self)
+
+		else:
+			self._store = Gtk.TreeStore(
+									# name is a string, but it can contain surrogates,
+									# so it can't be marshalled as a gstring.
+									GObject.TYPE_PYOBJECT,	# Column.NAME
+									str,	# Column.FORMATTED_NAME
+									str,	# Column.EXTENSION
+									float,	# Column.SIZE
+									str,	# Column.FORMATTED_SIZE
+									int,	# Column.MODE
+									str,	# Column.FORMATTED_MODE
+									int,	# Column.DATE
+									str,	# Column.FORMATTED_DATE
+									bool,	# Column.IS_DIR
+									bool,	# Column.IS_PARENT_DIR
+									bool,	# Column.IS_LINK
+									str,	# Column.COLOR
+									str,	# Column.ICON
+									bool,	# Column.SELECTED
+									GObject.TYPE_INT64,	# Column.USER_ID
+									GObject.TYPE_INT64,	# Column.GROUP_ID
+									GObject.TYPE_PYOBJECT,	# Column.EMBLEMS
+									GObject.TYPE_PYOBJECT	# Column.SORT_DATA
+								)
+
+			# sort keys are tuples which can only be compared in python
+			self._store.set_sort_func(Column.SORT_DATA, self._compare_sort_data)
 
 		# set item list model
 		self._item_list.set_model(self._store)
@@ -299,6 +307,7 @@ class FileList(ItemList):
 		# cache configuration locally
 		self._time_format = self._parent.options.section('item_list').get('time_format')
 		self._mode_format = self._parent.options.section('item_list').get('mode_format')
+		self._formatter = ItemFormatter(self._size_format, self._mode_format, self._time_format)
 
 		plugin_options = self._parent.plugin_options
 		if plugin_options.has_section(self._name) \
@@ -366,6 +375,8 @@ class FileList(ItemList):
 
 	def _handle_cursor_change(self, widget=None, data=None):
 		"""Handle cursor change"""
+		self._schedule_prefetch()
+
 		if not self._enable_media_preview or not self._item_list.has_focus():
 			return
 
@@ -393,31 +404,86 @@ class FileList(ItemList):
 		else:
 			self._thumbnail_view.hide()
 
+		# load thumbnails for adjacent items in advance
+		uris = []
+		for adjacent_iter in (item_list.iter_next(selected_iter), item_list.iter_previous(selected_iter)):
+			if adjacent_iter is None or item_list.get_value(adjacent_iter, Column.IS_DIR):
+				continue
+
+			adjacent_name = item_list.get_value(adjacent_iter, Column.NAME)
+			adjacent_uri = '{0}://{1}'.format(protocol, os.path.join(self.path, adjacent_name))
+			if self._thumbnail_view.can_have_thumbnail(adjacent_uri):
+				uris.append(adjacent_uri)
+
+		self._thumbnail_view.prefetch_thumbnails(uris)
+
 		return True
 
+	def _schedule_prefetch(self):
+		"""Schedule listing of directory under cursor and parent directory once
+		cursor stops moving"""
+		if not self._prefetch_directories:
+			return
+
+		if self._prefetch_timeout is not None:
+			GLib.source_remove(self._prefetch_timeout)
+
+		self._prefetch_timeout = GLib.timeout_add(self.prefetch_delay, self._prefetch_neighbours)
+
+	def _prefetch_neighbours(self):
+		"""Queue directory under cursor and parent directory for prefetching"""
+		self._prefetch_timeout = None
+		provider = self.get_provider()
+		prefetcher = self._parent.directory_prefetcher
+
+		# parent directory
+		parent_path = provider.get_parent_path(self.path)
+		if parent_path is not None and parent_path != self.path:
+			prefetcher.prefetch(provider, parent_path)
+
+		# directory under cursor
+		selection = self._item_list.get_selection()
+		item_list, selected_iter = selection.get_selected()
+
+		if selected_iter is not None \
+		and item_list.get_value(selected_iter, Column.IS_DIR) \
+		and not item_list.get_value(selected_iter, Column.IS_PARENT_DIR):
+			name = item_list.get_value(selected_iter, Column.NAME)
+			prefetcher.prefetch(provider, os.path.join(self.path, name))
+
+		return False
+
 	def _handle_tab_close(self):
 		"""Handle tab closing"""
 		ItemList._handle_tab_close(self)
 		self.cancel_monitors()
 		self._parent.disk_usage.cancel_all_for_object(self)
 
+		# cancel scheduled prefetch
+		if self._prefetch_timeout is not None:
+			GLib.source_remove(self._prefetch_timeout)
+			self._prefetch_timeout = None
+
 	def _handle_emblem_toggle(self, widget, emblem=None):
-		"""Handle toggling emblem for selected item."""
-		selection = self._get_selection(relative=True, files_only=False)
+		"""Handle toggling emblem for selected items."""
+		selection = self._get_selection_list(relative=True)
 		path = self._options.get('path')
-		absolute_path = os.path.join(self._options.get('path'), selection)
+		manager = self._parent.emblem_manager
 
-		# make sure we have emblem specified
-		if emblem is None:
+		# make sure we have emblem and selection
+		if emblem is None or selection is None:
 			return
 
-		# toggle emblem
-		item_path, item_name = os.path.split(absolute_path)
-		self._parent.emblem_manager.toggle_emblem(item_path, item_name, emblem)
+		items = [os.path.split(os.path.join(path, item)) for item in selection]
+
+		# add emblem unless all selected items already have it
+		active = not all(emblem in (manager.get_emblems(*item) or ()) for item in items)
+		manager.apply_emblem(items, emblem, active)
 
 		# notify monitor about change
 		queue = self.get_monitor().get_queue()
-		queue.put((MonitorSignals.EMBLEM_CHANGED, os.path.join(path, selection), None))
+		for item in selection:
+			queue.put((MonitorSignals.EMBLEM_CHANGED, os.path.join(path, item), None))
 
 		return True
 
@@ -560,6 +626,20 @@ class FileList(ItemList):
 
 		return True
 
+	def _generate_thumbnails(self, widget=None, data=None):
+		"""Start generating thumbnails for selected items."""
+		selection = self._get_selection_list(relative=True)
+
+		# return if there is no selection
+		if not selection:
+			return True
+
+		operation = ThumbnailOperation(self._parent, self.get_provider())
+		operation.set_selection(selection)
+		operation.start()
+
+		return True
+
 	def _expand_directory(self, widget=None, data=None):
 		"""Expand currently selected directory"""
 		selection = self._item_list.get_selection()
@@ -578,6 +658,10 @@ class FileList(ItemList):
 		if not is_dir or is_parent:
 			return True
 
+		# compact model doesn't support nested items
+		if self._compact_model:
+			return True
+
 		# show expanders if they are hidden
 		if not self._show_expanders:
 			self._show_expanders = True
@@ -589,6 +673,7 @@ class FileList(ItemList):
 			while child:
 				old_child = child
 				child = item_list.iter_next(old_child)
+				self._remove_from_index(old_child)
 				item_list.remove(old_child)
 
 		# start loader thread and expand directory
@@ -1176,194 +1261,279 @@ class FileList(ItemList):
 			selected = column is self._sort_column_widget
 			column.set_sort_indicator(selected)
 
-		# apply sorting function
 		order = [Gtk.SortType.DESCENDING, Gtk.SortType.ASCENDING][self._sort_ascending]
 		self._sort_column_widget.set_sort_order(order)
-		self._store.set_sort_column_id(Column.SORT_DATA, order)
+
+		# regenerate sort keys with sorting disabled and sort list once
+		self._clear_sort_function()
 		self._generate_sort_data()
+		self._restore_sort_function()
+
+		# move cursor to previously selected element
+		if focus_selected:
+			selection = self._item_list.get_selection()
+			item_list, iter_to_scroll = selection.get_selected()
+			if iter_to_scroll:
+				path_to_scroll = item_list.get_path(iter_to_scroll)
+				self._item_list.scroll_to_cell(path_to_scroll, None, True, 0.5)
 
 	def _clear_sort_function(self):
 		"""Clear sort settings"""
 		self._store.set_sort_column_id(Gtk.TREE_SORTABLE_UNSORTED_SORT_COLUMN_ID, True)
 
-	def _generate_sort_data(self, parent=None, iters=None):
-		"""Generate sort data for all iters in the first level or children of the provided
-		parent. Separate `iters` list is added as a convenience to allow regenerating sort
-		data for specific items in the list."""
-		bool_values = ['1', '0'] if self._sort_ascending else ['0', '1']
+	def _restore_sort_function(self):
+		"""Sort list using configured sort order"""
+		order = [Gtk.SortType.DESCENDING, Gtk.SortType.ASCENDING][self._sort_ascending]
+		self._store.set_sort_column_id(Column.SORT_DATA, order)
 
-		# find starting point
-		found_iter = None
-		if parent is None:
-			found_iter = self._store.get_iter_first()
+	def _compare_sort_data(self, store, iter1, iter2, data=None):
+		"""Compare sort keys of two items"""
+		key1 = store.get_value(iter1, Column.SORT_DATA)
+		key2 = store.get_value(iter2, Column.SORT_DATA)
 
-		elif self._store.iter_has_child(parent):
-			found_iter = self._store.iter_children(parent)
+		return (key1 > key2) - (key1 < key2)
 
-		def generate_data(for_iter):
-			is_dir = self._store.get_value(for_iter, Column.IS_DIR)
-			is_parent = self._store.get_value(for_iter, Column.IS_PARENT_DIR)
-			value = self._store.get_value(for_iter, self._sort_column)
+	def _get_sort_key(self, value, is_dir, is_parent_dir):
+		"""Return tuple used for sorting item with specified value of sort column.
 
-			if self._sort_number_sensitive and self._sort_column == Column.NAME:
-				value = ''.join([part.rjust(12, '0') if part.isdigit() else part for part in self.number_split.split(value)])
+		First element keeps parent directory and directories on top of the list
+		regardless of sort order. Names are split into text and number chunks
+		when number sensitive sorting is enabled.
 
-			if isinstance(value, str) and not self._sort_case_sensitive:
+		"""
+		ranks = (0, 1, 2) if self._sort_ascending else (2, 1, 0)
+		rank = ranks[0] if is_parent_dir else ranks[1] if is_dir else ranks[2]
+
+		if value is None:
+			value = ''
+
+		if isinstance(value, str):
+			if not self._sort_case_sensitive:
 				value = value.lower()
 
-			if isinstance(value, int) or isinstance(value, float):
-				value = str(value).rjust(12, '0')
+			if self._sort_number_sensitive and self._sort_column == Column.NAME:
+				chunks = self.number_split.split(value)
+				value = tuple(int(chunk) if index % 2 else chunk for index, chunk in enumerate(chunks))
+
+		return (rank, value)
+
+	def _get_sort_key_for_iter(self, for_iter):
+		"""Return sort key for existing item"""
+		is_dir, is_parent_dir, value = self._store.get(
+				for_iter,
+				Column.IS_DIR,
+				Column.IS_PARENT_DIR,
+				self._sort_column
+			)
 
-			return '{}{}{}'.format(bool_values[is_parent], bool_values[is_dir], value)
+		return self._get_sort_key(value, is_dir, is_parent_dir)
 
-		# collect data for all iters
+	def _generate_sort_data(self, parent=None, iters=None):
+		"""Generate sort data for all iters in the first level or children of the provided
+		parent. When `iters` list is specified only sort data for those items is updated."""
 		update_data = []
-		while found_iter:
-			update_data.append((found_iter, generate_data(found_iter)))
-			found_iter = self._store.iter_next(found_iter)
 
-		# process provided list
-		if iters:
+		if iters is not None:
 			for found_iter in iters:
-				update_data.append((found_iter, generate_data(found_iter)))
+				update_data.append((found_iter, self._get_sort_key_for_iter(found_iter)))
+
+		else:
+			# find starting point
+			found_iter = None
+			if parent is None:
+				found_iter = self._store.get_iter_first()
+
+			elif self._store.iter_has_child(parent):
+				found_iter = self._store.iter_children(parent)
+
+			# collect data for all iters
+			while found_iter:
+				update_data.append((found_iter, self._get_sort_key_for_iter(found_iter)))
+
+				# regenerate for children of expanded directories
+				if self._store.iter_has_child(found_iter):
+					self._generate_sort_data(found_iter)
+
 				found_iter = self._store.iter_next(found_iter)
 
 		# delayed data update since we can't read and write at the same time
 		for item_iter, sort_data in update_data:
 			self._store.set_value(item_iter, Column.SORT_DATA, sort_data)
 
-		# move cursor to previously selected element
-		selection = self._item_list.get_selection()
-		item_list, iter_to_scroll = selection.get_selected()
-		if iter_to_scroll:
-			path_to_scroll = item_list.get_path(iter_to_scroll)
-			self._item_list.scroll_to_cell(path_to_scroll, None, True, 0.5)
-
 	def _clear_list(self):
 		"""Clear item list."""
 		self._store.clear()
+		self._item_index.clear()
 
 	def _directory_changed(self, monitor, event, path, other_path, parent=None):
 		"""Callback method fired when contents of directory has been changed."""
+		self._directory_changed_batch(monitor, [(event, path, other_path)], parent)
+		return True
+
+	def _directory_changed_batch(self, monitor, events, parent=None):
+		"""Callback method fired with all the changes monitor collected during
+		single interval. Hidden files list, free space and status are updated
+		once for the whole batch and new items are added together."""
 		show_hidden = self._parent.options.section('item_list').get('show_hidden')
+		provider = self.get_provider()
+		monitor_parent = parent
 
-		# make sure we are working with relative paths
-		if path.startswith(self.path):
-			path = path[len(self.path)+1:]
+		# cache for list of always hidden files for each parent path
+		hidden_lists = {}
 
-		# get parent path
-		parent_path = None
+		# parent and names of items waiting in the queue
+		queue_parent = None
+		queued_names = set()
 
-		if parent is not None:
-			# form relative path for easier handling
-			parent_path = self._store.get_value(parent, Column.NAME)
+		def get_always_hidden(parent_path):
+			if parent_path in hidden_lists:
+				return hidden_lists[parent_path]
 
-		elif parent is None and os.path.sep in path:
-			# find parent for fallback monitor
-			path_fragments = path.split(os.path.sep)
-			parent_path = os.path.dirname(path)
-			path = path_fragments[-1]
-			path_fragments = path_fragments[:-1]
+			always_hidden = []
 
-			while len(path_fragments) > 0:
-				fragment = path_fragments.pop(0)
-				parent = self._find_iter_by_name(fragment, parent)
+			if not show_hidden and provider.exists('.hidden', relative_to=parent_path):
+				raw_file = provider.get_file_handle('.hidden', FileMode.READ, relative_to=parent_path)
+				always_hidden.extend(raw_file.read().splitlines())
+				raw_file.close()
 
-		# check for list of always hidden files
-		provider = self.get_provider()
-		always_hidden = []
+			# override hidden list with always visible items
+			always_hidden = [item for item in always_hidden if item not in self._always_visible_items]
+			hidden_lists[parent_path] = always_hidden
 
-		if not show_hidden and provider.exists('.hidden', relative_to=parent_path):
-			raw_file = provider.get_file_handle('.hidden', FileMode.READ, relative_to=parent_path)
-			always_hidden.extend(raw_file.read().splitlines())
-			raw_file.close()
+			return always_hidden
 
-		# override hidden list with always visible items
-		always_hidden = [item for item in always_hidden if item not in self._always_visible_items]
+		def get_parent_key(parent):
+			return None if parent is None else self._store.get_path(parent).to_string()
 
-		# node created
-		should_add = False
-		if event is MonitorSignals.CREATED:
-			# fix problem with duplicating items when file was saved with GIO
-			if self._find_iter_by_name(path, parent) is None:
-				should_add = True
-
-			# check for hidden item or backup file
-			if should_add \
-			and not show_hidden \
-			and (path[0] == '.' or path[-1] == '~') \
-			and path not in self._always_visible_items:
-				should_add = False
-
-			# check if path is in any of the filters
-			if should_add and len(always_hidden) > 0:
-				should_add = path not in always_hidden
-
-			# add item
-			if should_add:
-				self._add_item(path, parent, parent_path)
-				Gdk.threads_add_idle(GLib.PRIORITY_HIGH_IDLE, self._flush_queue, parent)
+		for event, path, other_path in events:
+			parent = monitor_parent
 
-			else:
-				self._update_item_details_by_name(path, parent, parent_path)
+			# make sure we are working with relative paths
+			if path.startswith(self.path):
+				path = path[len(self.path)+1:]
 
-		# node renamed
-		elif event is MonitorSignals.MOVED:
-			# fix problem with duplicating items when file was saved with GIO
-			if self._find_iter_by_name(other_path, parent) is None:
-				should_add = True
+			# get parent path
+			parent_path = None
 
-			# make sure we are working with relative paths
-			if other_path.startswith(self.path):
-				other_path = other_path[len(self.path) + 1:]
+			if parent is not None:
+				# form relative path for easier handling
+				parent_path = self._store.get_value(parent, Column.NAME)
 
-			# check for hidden item or backup file
-			if not show_hidden \
-			and (other_path[0] == '.' or other_path[-1] == '~') \
-			and other_path not in self._always_visible_items:
-				should_add = False
+			elif parent is None and os.path.sep in path:
+				# find parent for fallback monitor
+				path_fragments = path.split(os.path.sep)
+				parent_path = os.path.dirname(path)
+				path = path_fragments[-1]
+				path_fragments = path_fragments[:-1]
+
+				while len(path_fragments) > 0:
+					fragment = path_fragments.pop(0)
+					parent = self._find_iter_by_name(fragment, parent)
+
+			# check for list of always hidden files
+			always_hidden = get_always_hidden(parent_path)
+			parent_key = get_parent_key(parent)
+
+			# items queued for different parent or changed again need to be added first
+			if len(self._item_queue) > 0 and (
+					(parent_key, path) in queued_names
+					or (parent_key, other_path) in queued_names
+					or (
+						event in (MonitorSignals.CREATED, MonitorSignals.MOVED)
+						and get_parent_key(queue_parent) != parent_key
+					)
+				):
+				self._flush_queue(queue_parent)
+				queued_names.clear()
+
+			# node created
+			should_add = False
+			if event is MonitorSignals.CREATED:
+				# fix problem with duplicating items when file was saved with GIO
+				if self._find_iter_by_name(path, parent) is None:
+					should_add = True
+
+				# check for hidden item or backup file
+				if should_add \
+				and not show_hidden \
+				and (path[0] == '.' or path[-1] == '~') \
+				and path not in self._always_visible_items:
+					should_add = False
+
+				# check if path is in any of the filters
+				if should_add and len(always_hidden) > 0:
+					should_add = path not in always_hidden
+
+				# add item
+				if should_add:
+					self._add_item(path, parent, parent_path)
+					queue_parent = parent
+					queued_names.add((parent_key, path))
 
-			# check if path is in any of the filters
-			if should_add and len(always_hidden) > 0:
-				should_add = other_path not in always_hidden
+				else:
+					self._update_item_details_by_name(path, parent, parent_path)
 
-			self._delete_item_by_name(path, parent)
+			# node renamed
+			elif event is MonitorSignals.MOVED:
+				# fix problem with duplicating items when file was saved with GIO
+				if self._find_iter_by_name(other_path, parent) is None:
+					should_add = True
 
-			if should_add:
-				self._add_item(other_path, parent, parent_path)
-				Gdk.threads_add_idle(GLib.PRIORITY_HIGH_IDLE, self._flush_queue, parent)
-			else:
-				self._update_item_details_by_name(other_path, parent, parent_path)
+				# make sure we are working with relative paths
+				if other_path.startswith(self.path):
+					other_path = other_path[len(self.path) + 1:]
 
-		# node deleted
-		elif event is MonitorSignals.DELETED:
-			self._delete_item_by_name(path, parent)
+				# check for hidden item or backup file
+				if not show_hidden \
+				and (other_path[0] == '.' or other_path[-1] == '~') \
+				and other_path not in self._always_visible_items:
+					should_add = False
 
-		# node changed
-		elif event is MonitorSignals.CHANGED:
-			self._update_item_details_by_name(path, parent, parent_path)
+				# check if path is in any of the filters
+				if should_add and len(always_hidden) > 0:
+					should_add = other_path not in always_hidden
 
-		# attributes changes
-		elif event is MonitorSignals.ATTRIBUTE_CHANGED:
-			self._update_item_attributes_by_name(path, parent, parent_path)
+				self._delete_item_by_name(path, parent)
 
-		# emblem changes
-		elif event is MonitorSignals.EMBLEM_CHANGED:
-			self._update_emblems_by_name(path, parent, parent_path)
+				if should_add:
+					self._add_item(other_path, parent, parent_path)
+					queue_parent = parent
+					queued_names.add((parent_key, other_path))
 
-		# directory size calculation update
-		elif event is MonitorSignals.DIRECTORY_SIZE_CHANGED:
-			self._update_directory_size_by_name(path, parent)
+				else:
+					self._update_item_details_by_name(other_path, parent, parent_path)
+
+			# node deleted
+			elif event is MonitorSignals.DELETED:
+				self._delete_item_by_name(path, parent)
+
+			# node changed
+			elif event is MonitorSignals.CHANGED:
+				self._update_item_details_by_name(path, parent, parent_path)
 
-		# directory size calculation has finied
-		elif event is MonitorSignals.DIRECTORY_SIZE_STOPPED:
-			self._title_bar.hide_spinner()
+			# attributes changes
+			elif event is MonitorSignals.ATTRIBUTE_CHANGED:
+				self._update_item_attributes_by_name(path, parent, parent_path)
+
+			# emblem changes
+			elif event is MonitorSignals.EMBLEM_CHANGED:
+				self._update_emblems_by_name(path, parent, parent_path)
+
+			# directory size calculation update
+			elif event is MonitorSignals.DIRECTORY_SIZE_CHANGED:
+				self._update_directory_size_by_name(path, parent)
+
+			# directory size calculation has finied
+			elif event is MonitorSignals.DIRECTORY_SIZE_STOPPED:
+				self._title_bar.hide_spinner()
+
+		# add all new items at once
+		if len(self._item_queue) > 0:
+			self._flush_queue(queue_parent)
 
 		self._change_title_text()
 		self._update_status_with_statistis()
 
-		return True
-
 	def _select_all(self, widget, data=None):
 		"""Proxy method for selecting all items"""
 		if self._dirs['selected'] < self._dirs['count'] or self._files['selected'] < self._files['count']:
@@ -1504,41 +1674,87 @@ class FileList(ItemList):
 
 	def _find_iter_by_name(self, name, parent=None):
 		""" Find and return item by name"""
-		result = None
-		found_iter = None
+		# names of child items are stored relative to list path
+		if parent is not None:
+			name = os.path.join(self._store.get_value(parent, Column.NAME), name)
 
-		# find starting point
-		if parent is None:
-			found_iter = self._store.get_iter_first()
+		# compact model maintains its own index
+		if self._compact_model:
+			return self._store.find_iter(name)
 
-		elif self._store.iter_has_child(parent):
-			found_iter = self._store.iter_children(parent)
-			name = os.path.join(self._store.get_value(parent, Column.NAME), name)
+		return self._item_index.get(name)
 
-		# check all the iters for specified name
-		while found_iter:
-			if self._store.get_value(found_iter, Column.NAME) == name:
-				result = found_iter
-				break
+	def _remove_from_index(self, found_iter):
+		"""Remove item and its children from name index"""
+		if self._compact_model:
+			return
 
-			found_iter = self._store.iter_next(found_iter)
+		self._item_index.pop(self._store.get_value(found_iter, Column.NAME), None)
 
-		return result
+		child = self._store.iter_children(found_iter)
+		while child:
+			self._remove_from_index(child)
+			child = self._store.iter_next(child)
 
-	def _add_item(self, filename, parent=None, parent_path=None):
-		"""Add item to the list"""
+	def _format_name(self, filename, is_dir):
+		"""Return file name and extension formatted for display."""
+		if not is_dir:
+			if not self._second_extension:
+				# regular extension split
+				file_info = os.path.splitext(filename)
+
+			else:
+				# split with support for second level of extension
+				raw = filename.rsplit('.', 2)
+				file_info = (raw, '') if len(raw) == 0 else (raw[0], '.{0}'.format('.'.join(raw[1:])))
+
+			if self._show_full_name:
+				file_info = (filename, file_info[1])
+
+		else:
+			# don't allow extension splitting on directories
+			file_info = (filename, '')
+
+		return common.decode_file_name(file_info[0]), common.decode_file_name(file_info[1][1:])
+
+	def _format_size(self, size, is_dir):
+		"""Return file size formatted for display."""
+		return self._formatter.format_size(size, is_dir)
+
+	def _format_mode(self, mode):
+		"""Return access mode formatted for display."""
+		return self._formatter.format_mode(mode)
+
+	def _format_time(self, timestamp):
+		"""Return modification time formatted for display."""
+		return self._formatter.format_time(timestamp)
+
+	def _add_item(self, filename, parent=None, parent_path=None, file_stat=None, is_link=False):
+		"""Queue item to be added to the list on next flush
+
+		When file information is not provided, which is the case when single items
+		are added through monitor events, it will be retrieved from provider.
+
+		"""
+		data = self._create_item_data(filename, parent, parent_path, file_stat, is_link)
+
+		if data is not None:
+			self._item_queue.append(data)
+
+	def _create_item_data(self, filename, parent=None, parent_path=None, file_stat=None, is_link=False, emblem_cache=None, formatted=True):
+		"""Create row data for specified item"""
 		result = None
 		provider = self.get_provider()
 		full_path = os.path.join(self.path, parent_path) if parent_path else self.path
-		is_link = False
 
-		# get file information
-		file_stat = provider.get_stat(filename, relative_to=full_path)
+		if file_stat is None:
+			# get file information
+			file_stat = provider.get_stat(filename, relative_to=full_path)
 
-		# retrieve real information for special files
-		if file_stat.type is FileType.LINK:
-			is_link = True
-			file_stat = provider.get_stat(filename, relative_to=full_path, follow=True)
+			# retrieve real information for special files
+			if file_stat.type is FileType.LINK:
+				is_link = True
+				file_stat = provider.get_stat(filename, relative_to=full_path, follow=True)
 
 		# prepare values
 		file_size = file_stat.size
@@ -1546,59 +1762,48 @@ class FileList(ItemList):
 		file_date = file_stat.time_modify
 		is_dir = file_stat.type is FileType.DIRECTORY
 
+		if emblem_cache is None:
+			emblem_cache = self._emblem_cache
+
 		# directory
 		if file_stat.type is FileType.DIRECTORY:
 			directory_path = os.path.join(full_path, filename)
 			icon = self._parent.icon_manager.get_icon_for_directory(directory_path)
 
-			if parent is None:
-				self._dirs['count'] += 1
-
 		# regular file
 		elif file_stat.type is FileType.REGULAR:
 			icon = self._parent.icon_manager.get_icon_for_file(filename)
 
-			if parent is None:
-				self._files['count'] += 1
-				self._size['total'] += file_size
-
 		# invalid links or files
 		else:
 			icon = 'image-missing'
 
-			if parent is None:
-				self._files['count'] += 1
-
 		# add item to the list
 		try:
-			# don't allow extension splitting on directories
-			formatted_file_mode = common.format_mode(file_mode, self._mode_format)
-			formatted_file_date = time.strftime(self._time_format, time.localtime(file_date))
-
-			if not is_dir:
-				if not self._second_extension:
-					# regular extension split
-					file_info = os.path.splitext(filename)
-
-				else:
-					# split with support for second level of extension
-					raw = filename.rsplit('.', 2)
-					file_info = (raw, '') if len(raw) == 0 else (raw[0], '.{0}'.format('.'.join(raw[1:])))
-
-				if self._show_full_name:
-					file_info = (filename, file_info[1])
-
-				formatted_file_size = common.format_size(file_size, self._size_format, False)
+			if not self._compact_model and formatted:
+				formatted_name, formatted_extension = self._format_name(filename, is_dir)
+				formatted_file_size = self._format_size(file_size, is_dir)
+				formatted_file_mode = self._format_mode(file_mode)
+				formatted_file_date = self._format_time(file_date)
+
+			elif not self._compact_model:
+				# size, mode and time are formatted later for all rows at once
+				formatted_name, formatted_extension = self._format_name(filename, is_dir)
+				formatted_file_size = None
+				formatted_file_mode = None
+				formatted_file_date = None
 
 			else:
-				# item is a directory
-				file_info = (filename, '')
-				formatted_file_size = '<DIR>'
+				# compact model formats values on demand
+				formatted_name, formatted_extension = None, None
+				formatted_file_size = None
+				formatted_file_mode = None
+				formatted_file_date = None
 
 			data = (
 					os.path.join(parent_path, filename) if parent_path else filename,
-					common.decode_file_name(file_info[0]),
-					common.decode_file_name(file_info[1][1:]),
+					formatted_name,
+					formatted_extension,
 					file_size,
 					formatted_file_size,
 					file_mode,
@@ -1613,14 +1818,15 @@ class FileList(ItemList):
 					None,
 					file_stat.user_id,
 					file_stat.group_id,
-					self._emblem_cache[filename] if filename in self._emblem_cache else None,
-					''
+					emblem_cache[filename] if filename in emblem_cache else None
 				)
 
-			self._item_queue.append(data)
+			# generate sort key, extension is not known in advance for compact model
+			sort_value = data[self._sort_column]
+			if sort_value is None and self._sort_column == Column.EXTENSION:
+				sort_value = self._format_name(filename, is_dir)[1]
 
-			if len(self._item_queue) == 100:
-				Gdk.threads_add_idle(GLib.PRIORITY_HIGH_IDLE, self._flush_queue, parent)
+			result = data + (self._get_sort_key(sort_value, is_dir, False),)
 
 		except Exception as error:
 			print(u'Error: {0} - {1}'.format(filename, str(error)))
@@ -1629,24 +1835,13 @@ class FileList(ItemList):
 
 	def _flush_queue(self, parent=None):
 		"""Add items in queue to the list"""
-		queued_iters = []
-		path_to_select = None
+		# items were already added by earlier call
+		if len(self._item_queue) == 0:
+			return False
 
 		# add items from the queue
 		for data in self._item_queue:
-			new_iter = self._store.append(parent, data)
-			queued_iters.append(new_iter)
-
-			# focus specified item
-			if self._item_to_focus == data[0]:
-				path_to_select = self._store.get_path(new_iter)
-
-		# schedule sort data update
-		Gdk.threads_add_idle(GLib.PRIORITY_DEFAULT_IDLE, self._generate_sort_data)
-
-		# select path if needed
-		if path_to_select is not None:
-			Gdk.threads_add_idle(GLib.PRIORITY_HIGH_IDLE, self._item_list.set_cursor, path_to_select)
+			self._append_item(parent, data)
 
 		# clear item queue
 		self._item_queue[:] = []
@@ -1655,6 +1850,190 @@ class FileList(ItemList):
 		if parent is not None:
 			self._item_list.expand_row(self._store.get_path(parent), False)
 
+	def _append_item(self, parent, data):
+		"""Add row to the list, update statistics and focus it if needed"""
+		new_iter = self._store.append(parent, data)
+
+		# update statistics
+		if parent is None:
+			if data[Column.IS_DIR]:
+				self._dirs['count'] += 1
+
+			else:
+				self._files['count'] += 1
+				self._size['total'] += data[Column.SIZE]
+
+		# add item to name index
+		if not self._compact_model:
+			self._item_index[data[0]] = new_iter
+
+		# focus specified item
+		if self._item_to_focus == data[0]:
+			self._item_list.set_cursor(self._store.get_path(new_iter))
+
+	def _is_current_load(self, generation):
+		"""Check if loader thread with specified generation is still relevant"""
+		return generation == self._load_generation
+
+	def _queue_load_action(self, generation, callback, *args):
+		"""Queue action to be executed in main thread in order it was added. Blocks
+		while queue is full and returns False if load was superseded meanwhile."""
+		while True:
+			if not self._is_current_load(generation):
+				return False
+
+			try:
+				self._load_queue.put((generation, callback, args), timeout=0.1)
+				break
+
+			except QueueFullException:
+				pass
+
+		# make sure main thread is consuming the queue
+		with self._load_queue_lock:
+			if not self._load_queue_scheduled:
+				self._load_queue_scheduled = True
+				Gdk.threads_add_idle(GLib.PRIORITY_DEFAULT_IDLE, self._process_load_queue)
+
+		return True
+
+	def _get_entry_sort_key(self, entry, parent_path=None):
+		"""Return sort key for directory entry without creating its row or None
+		if value of sort column is only known once row is created."""
+		is_dir = entry.info.type is FileType.DIRECTORY
+
+		if self._sort_column == Column.NAME:
+			value = os.path.join(parent_path, entry.name) if parent_path else entry.name
+
+		elif self._sort_column == Column.EXTENSION:
+			value = self._format_name(entry.name, is_dir)[1]
+
+		elif self._sort_column == Column.SIZE:
+			value = entry.info.size
+
+		elif self._sort_column == Column.MODE:
+			value = entry.info.mode
+
+		elif self._sort_column == Column.TIME:
+			value = entry.info.time_modify
+
+		else:
+			return None
+
+		return self._get_sort_key(value, is_dir, False)
+
+	def _create_load_rows(self, generation, item_list, parent=None, parent_path=None, emblem_cache=None):
+		"""Create sorted rows for directory entries. Returns None if load was superseded."""
+		rows = []
+
+		for entry in item_list:
+			# stop if we are no longer needed
+			if not self._is_current_load(generation):
+				return None
+
+			data = self._create_item_data(
+					entry.name,
+					parent,
+					parent_path,
+					entry.info,
+					entry.is_link,
+					emblem_cache,
+					formatted=False
+				)
+			if data is not None:
+				rows.append(data)
+
+		# format values shared between many rows only once
+		if not self._compact_model:
+			rows = self._formatter.format_rows(rows)
+
+		# appending rows in sorted order doesn't require moving them
+		rows.sort(key=lambda row: row[Column.SORT_DATA], reverse=not self._sort_ascending)
+
+		return rows
+
+	def _queue_load_items(self, generation, item_list, parent=None, parent_path=None, emblem_cache=None):
+		"""Create rows for directory entries in loader thread and queue them in order
+		they will be displayed, so rows visible on the screen are added first.
+
+		When sort key can be determined from entry alone, rows at the top of the
+		list are created and queued before the rest of directory is processed.
+
+		"""
+		batches = [item_list]
+
+		if len(item_list) > self.first_batch_size:
+			keys = [self._get_entry_sort_key(entry, parent_path) for entry in item_list]
+
+			if None not in keys:
+				select = heapq.nsmallest if self._sort_ascending else heapq.nlargest
+				first = select(self.first_batch_size, range(len(item_list)), key=keys.__getitem__)
+				first_set = set(first)
+
+				batches = [
+						[item_list[index] for index in first],
+						[entry for index, entry in enumerate(item_list) if index not in first_set]
+					]
+
+		for batch in batches:
+			rows = self._create_load_rows(generation, batch, parent, parent_path, emblem_cache)
+
+			if rows is None:
+				return
+
+			for data in rows:
+				if not self._queue_load_action(generation, self._append_item, parent, data):
+					return
+
+	def _process_load_queue(self):
+		"""Execute actions queued by loader thread until frame budget is spent"""
+		deadline = time.monotonic() + self.frame_budget
+
+		while time.monotonic() < deadline:
+			try:
+				generation, callback, args = self._load_queue.get(False)
+
+			except QueueEmptyException:
+				with self._load_queue_lock:
+					# loader thread might have added something meanwhile
+					if self._load_queue.empty():
+						self._load_queue_scheduled = False
+						return False
+
+				continue
+
+			# discard results of superseded loads
+			if self._is_current_load(generation):
+				callback(*args)
+
+		return True
+
+	def _clear_load_queue(self):
+		"""Discard actions queued by previous loader thread"""
+		while True:
+			try:
+				self._load_queue.get(False)
+
+			except QueueEmptyException:
+				break
+
+	def _finish_loading(self, parent=None, emblem_cache=None, item_names=None):
+		"""Update list once all loaded items were added"""
+		self._loading = False
+
+		# forget item for selection if it wasn't in the listing
+		if item_names is not None and self._item_to_focus not in item_names:
+			self._item_to_focus = None
+
+		if emblem_cache is not None:
+			self._emblem_cache = emblem_cache
+
+		if parent is not None:
+			self._item_list.expand_row(self._store.get_path(parent), False)
+
+		self._title_bar.hide_spinner()
+		self._update_status_with_statistis()
+
 	def _delete_item_by_name(self, name, parent):
 		"""Removes item with 'name' from the list"""
 		selection = self._item_list.get_selection()
@@ -1669,26 +2048,29 @@ class FileList(ItemList):
 		found_iter = self._find_iter_by_name(name, parent)
 
 		if found_iter is not None:
-			iter_name = self._store.get_value(found_iter, Column.NAME)
+			self._remove_item(found_iter)
 
-			if item_list.get_value(found_iter, Column.IS_DIR):
-				self._dirs['count'] -= 1
+	def _remove_item(self, found_iter):
+		"""Remove item from the list and update statistics"""
+		if self._store.get_value(found_iter, Column.IS_DIR):
+			self._dirs['count'] -= 1
 
-				# update selected counters
-				if item_list.get_value(found_iter, Column.SELECTED):
-					self._dirs['selected'] -= 1
+			# update selected counters
+			if self._store.get_value(found_iter, Column.SELECTED):
+				self._dirs['selected'] -= 1
 
-			else:
-				self._files['count'] -= 1
-				self._size['total'] -= item_list.get_value(found_iter, Column.SIZE)
+		else:
+			self._files['count'] -= 1
+			self._size['total'] -= self._store.get_value(found_iter, Column.SIZE)
 
-				# update selected counters
-				if item_list.get_value(found_iter, Column.SELECTED):
-					self._files['selected'] -= 1
-					self._size['selected'] -= item_list.get_value(found_iter, Column.SIZE)
+			# update selected counters
+			if self._store.get_value(found_iter, Column.SELECTED):
+				self._files['selected'] -= 1
+				self._size['selected'] -= self._store.get_value(found_iter, Column.SIZE)
 
-			# remove
-			self._store.remove(found_iter)
+		# remove
+		self._remove_from_index(found_iter)
+		self._store.remove(found_iter)
 
 	def _update_item_details_by_name(self, name, parent, parent_path):
 		"""Update item details (size, time, etc.) on changed event"""
@@ -1697,35 +2079,145 @@ class FileList(ItemList):
 
 		if found_iter is not None:
 			# get node stats
-			is_dir = self._store.get_value(found_iter, Column.IS_DIR)
 			path = self.path if parent_path is None else os.path.join(self.path, parent_path)
 			file_stat = provider.get_stat(name, relative_to=path)
 
-			file_size = file_stat.size
-			file_mode = file_stat.mode
-			file_date = file_stat.time_modify
+			# update list store
+			self._update_item_details(found_iter, file_stat)
 
-			if not is_dir:
-				# format file size
-				formatted_file_size = common.format_size(file_size, self._size_format, False)
+	def _update_item_details(self, found_iter, file_stat):
+		"""Update size, mode and time of existing item along with statistics"""
+		is_dir = self._store.get_value(found_iter, Column.IS_DIR)
+		file_size = file_stat.size
+		file_mode = file_stat.mode
+		file_date = file_stat.time_modify
 
-			else:
-				# item is a directory
-				formatted_file_size = '<DIR>'
+		# update total size
+		if not is_dir:
+			size_difference = file_size - self._store.get_value(found_iter, Column.SIZE)
+			self._size['total'] += size_difference
 
-			formatted_file_mode = common.format_mode(file_mode, self._mode_format)
-			formatted_file_date = time.strftime(self._time_format, time.localtime(file_date))
+			if self._store.get_value(found_iter, Column.SELECTED):
+				self._size['selected'] += size_difference
 
-			# update list store
-			self._store.set_value(found_iter, Column.SIZE, file_size)
-			self._store.set_value(found_iter, Column.MODE, file_mode)
-			self._store.set_value(found_iter, Column.TIME, file_date)
-			self._store.set_value(found_iter, Column.FORMATTED_SIZE, formatted_file_size)
-			self._store.set_value(found_iter, Column.FORMATTED_MODE, formatted_file_mode)
-			self._store.set_value(found_iter, Column.FORMATTED_TIME, formatted_file_date)
+		# update list store
+		self._store.set_value(found_iter, Column.SIZE, file_size)
+		self._store.set_value(found_iter, Column.MODE, file_mode)
+		self._store.set_value(found_iter, Column.TIME, file_date)
 
-			# regenerate sort data
-			self._generate_sort_data(iters=[found_iter,])
+		if not self._compact_model:
+			self._store.set_value(found_iter, Column.FORMATTED_SIZE, self._format_size(file_size, is_dir))
+			self._store.set_value(found_iter, Column.FORMATTED_MODE, self._format_mode(file_mode))
+			self._store.set_value(found_iter, Column.FORMATTED_TIME, self._format_time(file_date))
+
+		# regenerate sort data
+		self._generate_sort_data(iters=[found_iter,])
+
+	def _get_item_details(self):
+		"""Return dictionary with details of top level items used to detect changes"""
+		result = {}
+		found_iter = self._store.get_iter_first()
+
+		while found_iter:
+			name, is_dir, is_parent_dir, size, mode, date = self._store.get(
+					found_iter,
+					Column.NAME,
+					Column.IS_DIR,
+					Column.IS_PARENT_DIR,
+					Column.SIZE,
+					Column.MODE,
+					Column.TIME
+				)
+
+			if not is_parent_dir:
+				result[name] = (is_dir, size, mode, int(date))
+
+			found_iter = self._store.iter_next(found_iter)
+
+		return result
+
+	def _get_entry_details(self, item_list):
+		"""Return dictionary with details of directory entries used to detect changes"""
+		return {
+				entry.name: (
+					entry.info.type is FileType.DIRECTORY,
+					entry.info.size,
+					entry.info.mode,
+					int(entry.info.time_modify)
+				)
+				for entry in item_list
+			}
+
+	def _filter_item_list(self, provider, path, item_list, show_hidden):
+		"""Return directory entries without hidden items"""
+		if show_hidden:
+			return item_list
+
+		always_hidden = []
+
+		# get list of always hidden files from the directory file
+		if provider.exists('.hidden', relative_to=path):
+			raw_file = provider.get_file_handle('.hidden', FileMode.READ, relative_to=path)
+			always_hidden.extend(raw_file.read().splitlines())
+			raw_file.close()
+
+		# override hidden list with always visible items
+		always_hidden = [item for item in always_hidden if item not in self._always_visible_items]
+
+		# filter out hidden items and backup files
+		item_list = [
+				entry for entry in item_list
+				if (entry.name[0] != '.' and entry.name[-1] != '~') or entry.name in self._always_visible_items
+			]
+
+		# filter out items specified in directory file or program
+		if len(always_hidden) > 0:
+			item_list = [entry for entry in item_list if entry.name not in always_hidden]
+
+		return item_list
+
+	def _compare_items(self, item_details, item_list):
+		"""Compare directory listing with existing item details and return tuple
+		containing set of removed names, list of changed and list of new entries."""
+		removed = set(item_details)
+		changed = []
+		added = []
+
+		for entry in item_list:
+			details = item_details.get(entry.name)
+			is_dir = entry.info.type is FileType.DIRECTORY
+
+			# new items and items which changed type are added again
+			if details is None or details[0] != is_dir:
+				added.append(entry)
+				continue
+
+			removed.discard(entry.name)
+
+			if details[1:] != (entry.info.size, entry.info.mode, int(entry.info.time_modify)):
+				changed.append(entry)
+
+		return removed, changed, added
+
+	def _apply_item_changes(self, removed, changed):
+		"""Remove and update items found while refreshing directory in place"""
+		for name in removed:
+			found_iter = self._find_iter_by_name(name)
+			if found_iter is not None:
+				self._remove_item(found_iter)
+
+		for entry in changed:
+			found_iter = self._find_iter_by_name(entry.name)
+			if found_iter is not None:
+				self._update_item_details(found_iter, entry.info)
+
+		# focus requested item
+		if self._item_to_focus is not None:
+			found_iter = self._find_iter_by_name(self._item_to_focus)
+			if found_iter is not None:
+				self._item_list.set_cursor(self._store.get_path(found_iter))
+
+		self._update_status_with_statistis()
 
 	def _update_item_attributes_by_name(self, name, parent, parent_path):
 		"""Update item attributes column by name"""
@@ -1739,14 +2231,14 @@ class FileList(ItemList):
 
 			file_mode = file_stat.mode
 			file_date = file_stat.time_modify
-			formatted_file_mode = common.format_mode(file_mode, self._mode_format)
-			formatted_file_date = time.strftime(self._time_format, time.localtime(file_date))
 
 			# update list store
 			self._store.set_value(found_iter, Column.MODE, file_mode)
 			self._store.set_value(found_iter, Column.TIME, file_date)
-			self._store.set_value(found_iter, Column.FORMATTED_MODE, formatted_file_mode)
-			self._store.set_value(found_iter, Column.FORMATTED_TIME, formatted_file_date)
+
+			if not self._compact_model:
+				self._store.set_value(found_iter, Column.FORMATTED_MODE, self._format_mode(file_mode))
+				self._store.set_value(found_iter, Column.FORMATTED_TIME, self._format_time(file_date))
 
 			# regenerate sort data
 			self._generate_sort_data(iters=[found_iter,])
@@ -1791,7 +2283,11 @@ class FileList(ItemList):
 				path = path_at_row
 				action = drag_context.get_actions()
 			else:
-				path = self._store.get_path(self._store.iter_parent(under_cursor))
+				parent = self._store.iter_parent(under_cursor)
+
+				# items in top level are dropped into current directory
+				if parent is not None:
+					path = self._store.get_path(parent)
 
 		except TypeError:
 			pass
@@ -1956,15 +2452,17 @@ class FileList(ItemList):
 		"""Return integer representing supported drag'n'drop actions"""
 		return Gdk.DragAction.COPY | Gdk.DragAction.MOVE | Gdk.DragAction.ASK | Gdk.DragAction.LINK
 
-	def _load_directory(self, path, parent=None, clear_store=False):
-		"""Load directory content into store"""
-		# if there is already active thread, stop it
-		if self._thread_active.is_set():
-			self._main_thread_lock.set()
-			self._thread_active.clear()
+	def _load_directory(self, path, parent=None, clear_store=False, incremental=False):
+		"""Load directory content into store
 
-			while self._main_thread_lock.is_set():
-				Gtk.main_iteration_do(blocking=False)
+		In incremental mode existing items are compared with directory listing
+		and only differences are applied to the store.
+
+		"""
+		# start new generation, active loader thread will notice and stop on its own
+		self._load_generation += 1
+		self._loading = True
+		generation = self._load_generation
 
 		# disable updates on cursor change
 		self._item_list.handler_block_by_func(self._handle_cursor_change)
@@ -1973,8 +2471,9 @@ class FileList(ItemList):
 		if clear_store:
 			self._clear_list()
 
-		# clear item queue
+		# clear item queues
 		self._item_queue[:] = []
+		self._clear_load_queue()
 
 		# default value for parent path
 		parent_path = None
@@ -1982,91 +2481,75 @@ class FileList(ItemList):
 		# cache objects and settings
 		show_hidden = self._parent.options.section('item_list').get('show_hidden')
 
+		# collect details of existing items for comparison
+		item_details = self._get_item_details() if incremental else None
+
 		# add parent option for parent directory
 		if path != self.get_provider().get_root_path(path):
-			if parent is None:
+			if parent is not None:
+				# prepare full parent path
+				parent_path = self._store.get_value(parent, Column.NAME)
+
+			elif not incremental:
 				self._store.append(parent, (
 					os.path.pardir, os.path.pardir, '', -2, '<DIR>', -1, '', -1,
-					'', True, True, False, None, 'go-up', None, 0, 0, None, ''
+					'', True, True, False, None, 'go-up', None, 0, 0, None,
+					self._get_sort_key(os.path.pardir, True, True)
 					))
 
-			else:
-				# prepare full parent path
-				parent_path = self._store.get_value(parent, Column.NAME)
+		self._title_bar.show_spinner()
 
 		# load items in separate thread
 		def thread_method():
-			self._thread_active.set()
-			Gdk.threads_add_idle(GLib.PRIORITY_DEFAULT_IDLE, self._title_bar.show_spinner)
-
 			# preload emblems for faster operation
-			self._emblem_cache = self._parent.emblem_manager.get_emblems_for_path(path)
+			emblem_cache = self._parent.emblem_manager.get_emblems_for_path(path)
+
+			provider = self.get_provider()
+			existing_items = item_details
+
+			# show recent listing from cache right away and reconcile it with directory later
+			if existing_items is None and parent is None:
+				cached_list = provider.get_cached_listing(path)
+
+				if cached_list is not None:
+					cached_list = self._filter_item_list(provider, path, cached_list, show_hidden)
+					self._queue_load_items(generation, cached_list, parent, parent_path, emblem_cache)
+					existing_items = self._get_entry_details(cached_list)
 
-			# get initial directory listing
+			# get initial directory listing along with item statistics
 			try:
-				provider = self.get_provider()
-				item_list = provider.list_dir(path)
+				item_list = provider.list_dir_with_stat(path)
+				provider.cache_listing(path, item_list)
 
 			except Exception as error:
 				print('Load directory error: ', str(error))
 
-				# clear locks and exit
-				self._thread_active.clear()
-				self._main_thread_lock.clear()
-
-				Gdk.threads_add_idle(GLib.PRIORITY_DEFAULT_IDLE, self._title_bar.hide_spinner)
+				self._queue_load_action(generation, self._finish_loading, parent)
 				return
 
 			# remove hidden files if we don't need them
-			if not show_hidden:
-				always_hidden = []
-
-				# get list of always hidden files from the directory file
-				if provider.exists('.hidden', relative_to=path):
-					raw_file = provider.get_file_handle('.hidden', FileMode.READ, relative_to=path)
-					always_hidden.extend(raw_file.read().splitlines())
-					raw_file.close()
-
-				# override hidden list with always visible items
-				always_hidden = [item for item in always_hidden if item not in self._always_visible_items]
-
-				# filter out hidden items and backup files
-				item_list = [name for name in item_list if (name[0] != '.' and name[-1] != '~') or name in self._always_visible_items]
-
-				# filter out items specified in directory file or program
-				if len(always_hidden) > 0:
-					item_list = [name for name in item_list if name not in always_hidden]
-
-			# assign item for selection
-			if not self._item_to_focus in item_list:
-				self._item_to_focus = None
+			item_list = self._filter_item_list(provider, path, item_list, show_hidden)
 
-			for item_name in item_list:
-				# check if we are allowed to continue as we don't want
-				# items from different directory ending up in our list
-				if not self._thread_active.is_set():
-					break
+			# names used to check item for selection once loading is finished
+			item_names = set(entry.name for entry in item_list)
 
-				# add item to the list
-				self._add_item(item_name, parent, parent_path)
+			# apply only differences to existing items
+			if existing_items is not None:
+				removed, changed, item_list = self._compare_items(existing_items, item_list)
+				self._queue_load_action(generation, self._apply_item_changes, removed, changed)
 
-			Gdk.threads_add_idle(GLib.PRIORITY_HIGH_IDLE, self._flush_queue, parent)
+			# add items to the list
+			self._queue_load_items(generation, item_list, parent, parent_path, emblem_cache)
 
-			# hide spinner animation
-			Gdk.threads_add_idle(GLib.PRIORITY_DEFAULT_IDLE, self._title_bar.hide_spinner)
+			# hide spinner animation and update status bar
+			self._queue_load_action(generation, self._finish_loading, parent, emblem_cache, item_names)
 
-			# update status bar
-			Gdk.threads_add_idle(GLib.PRIORITY_DEFAULT_IDLE, self._update_status_with_statistis)
-
-			# release locks
-			self._thread_active.clear()
-			self._main_thread_lock.clear()
-
-			# create directory monitor
-			self.monitor_path(path, parent)
+			# create directory monitor, existing one is kept when refreshing
+			if item_details is None:
+				self._queue_load_action(generation, self.monitor_path, path, parent)
 
 		# create new thread
-		self._change_path_thread = Thread(target=thread_method)
+		self._change_path_thread = Thread(target=thread_method, daemon=True)
 		self._change_path_thread.start()
 
 		# enable updates on cursor change
@@ -2106,8 +2589,19 @@ class FileList(ItemList):
 		# update list
 		self._store.set_value(found_iter, Column.FORMATTED_SIZE, formatted_size)
 
-	def change_path(self, path=None, selected=None):
-		"""Change file list path."""
+	def change_path(self, path=None, selected=None, reload=False):
+		"""Change file list path.
+
+		When path matches currently loaded directory, list is updated in place
+		by applying only the differences unless `reload` is specified.
+
+		"""
+		if not reload and self._can_refresh_in_place(path):
+			self._item_to_focus = selected
+			self._change_title_text(self.path)
+			self._load_directory(self.path, incremental=True)
+			return
+
 		# cancel current directory monitor
 		self.cancel_monitors()
 
@@ -2329,7 +2823,13 @@ class FileList(ItemList):
 
 		return result
 
-	def refresh_file_list(self, widget=None, data=None):
+	def _can_refresh_in_place(self, path):
+		"""Check if list can be updated in place instead of being reloaded."""
+		return path == self.path \
+				and len(self._store) > 0 \
+				and not self._loading
+
+	def refresh_file_list(self, widget=None, data=None, reload=False):
 		"""Reload file list for current directory"""
 		selection = self._item_list.get_selection()
 		item_list, selected_iter = selection.get_selected()
@@ -2340,7 +2840,7 @@ class FileList(ItemList):
 			f_name = item_list.get_value(selected_iter, Column.NAME)
 
 		# reload path
-		self.change_path(self.path, f_name)
+		self.change_path(self.path, f_name, reload)
 
 		return True
 
@@ -2360,6 +2860,7 @@ class FileList(ItemList):
 
 		# load list of always visible items
 		self._always_visible_items = section.get('always_visible')
+		self._prefetch_directories = section.get('prefetch_directories')
 
 		# apply column visibility and sizes
 		self._reorder_columns()
@@ -2386,6 +2887,7 @@ class FileList(ItemList):
 		# cache settings
 		self._time_format = section.get('time_format')
 		self._mode_format = section.get('mode_format')
+		self._formatter = ItemFormatter(self._size_format, self._mode_format, self._time_format)
 
 		if plugin_options.has_section(self._name) \
 		and plugin_options.section(self._name).has('columns'):
@@ -2395,7 +2897,7 @@ class FileList(ItemList):
 			self._show_full_name = False
 
 		# reload file list in order to apply time formatting, hidden files and other
-		self.refresh_file_list()
+		self.refresh_file_list(reload=True)
 
 	def apply_media_preview_settings(self):
 		"""Apply settings related to image_preview"""
@@ -0,0 +1,90 @@
+from __future__ import absolute_import
+
+import re
+import time
+
+from sunflower import common
+from .column import Column
+
+
+class ItemFormatter:
+	"""Formats size, access mode and modification time of list items.
+
+	Formatted values are remembered so items sharing the same mode, size or
+	minute of modification are formatted only once. Formatter is created
+	for specific set of formats and should be replaced when they change.
+
+	"""
+
+	cache_size = 8192  # maximum number of remembered sizes and times
+	second_directives = re.compile('%[-_0^#]*[EO]?[SsTcXr+]')
+
+	def __init__(self, size_format, mode_format, time_format):
+		self._size_format = size_format
+		self._mode_format = mode_format
+		self._time_format = time_format
+
+		# time formats without seconds can be shared by whole minute
+		self._time_resolution = 1 if self.second_directives.search(time_format) else 60
+
+		self._sizes = {}
+		self._modes = {}
+		self._times = {}
+
+	def format_size(self, size, is_dir):
+		"""Return file size formatted for display."""
+		if is_dir:
+			return '<DIR>'
+
+		result = self._sizes.get(size)
+
+		if result is None:
+			result = common.format_size(size, self._size_format, False)
+
+			if len(self._sizes) >= self.cache_size:
+				self._sizes = {}
+
+			self._sizes[size] = result
+
+		return result
+
+	def format_mode(self, mode):
+		"""Return access mode formatted for display."""
+		result = self._modes.get(mode)
+
+		if result is None:
+			result = common.format_mode(mode, self._mode_format)
+			self._modes[mode] = result
+
+		return result
+
+	def format_time(self, timestamp):
+		"""Return modification time formatted for display."""
+		key = int(timestamp) // self._time_resolution
+		result = self._times.get(key)
+
+		if result is None:
+			result = time.strftime(self._time_format, time.localtime(key * self._time_resolution))
+
+			if len(self._times) >= self.cache_size:
+				self._times = {}
+
+			self._times[key] = result
+
+		return result
+
+	def format_rows(self, rows):
+		"""Return list rows with formatted size, mode and time columns filled in."""
+		result = []
+		format_size = self.format_size
+		format_mode = self.format_mode
+		format_time = self.format_time
+
+		for row in rows:
+			row = list(row)
+			row[Column.FORMATTED_SIZE] = format_size(row[Column.SIZE], row[Column.IS_DIR])
+			row[Column.FORMATTED_MODE] = format_mode(row[Column.MODE])
+			row[Column.FORMATTED_TIME] = format_time(row[Column.TIME])
+			result.append(tuple(row))
+
+		return result
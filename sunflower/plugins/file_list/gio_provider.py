@@ -14,6 +14,7 @@ class GioProvider(Provider):
 	"""Generic provider for file systems supported by GIO"""
 	is_local = False
 	protocol = ''
+	listing_cache_ttl = 30
 
 	def is_file(self, path, relative_to=None):
 		"""Test if given path is file"""
@@ -9,6 +9,9 @@ from sunflower.plugin_base.monitor import Monitor, MonitorSignals, MonitorError
 class LocalMonitor(Monitor):
 	"""Local file monitor based on GIO"""
 
+	# shorter interval since all events go through the queue
+	TIMEOUT = 250
+
 	# signals translation table
 	_signal_table = {
 			Gio.FileMonitorEvent.CHANGED: MonitorSignals.CHANGED,
@@ -63,10 +66,13 @@ class LocalMonitor(Monitor):
 		if path is not None:
 			path = path.get_basename()
 
-		self._emit_signal(signal, path, other_path)
+		# queue event to be emitted along with others in the same interval
+		self._queue.put((signal, path, other_path))
 
 	def cancel(self):
 		"""Cancel monitoring"""
+		Monitor.cancel(self)
+
 		if self._monitor is not None:
 			self._monitor.cancel()
 
@@ -3,14 +3,19 @@ from __future__ import absolute_import, print_function
 import os
 import sys
 import stat
+import fcntl
 import shutil
 
 from gi.repository import Gio
 from .local_monitor import LocalMonitor
-from sunflower.plugin_base.provider import Provider, FileType, FileInfo, FileInfoExtended, SystemSize
+from sunflower.plugin_base.provider import Provider, FileType, FileInfo, FileInfoExtended, SystemSize, DirectoryEntry
 from sunflower.plugin_base.provider import Support, TrashError
 
 
+# ioctl request for sharing data between files, from linux/fs.h
+FICLONE = 0x40049409
+
+
 class LocalProvider(Provider):
 	"""Content provider for local files"""
 	is_local = True
@@ -106,6 +111,44 @@ class LocalProvider(Provider):
 		real_mode = ('rb', 'wb', 'ab', 'a+b')[mode]
 		return open(real_path, real_mode)
 
+	def clone_file(self, source_handle, destination_handle):
+		"""Make destination file share data with source file without copying it."""
+		destination_handle.flush()
+		fcntl.ioctl(destination_handle.fileno(), FICLONE, source_handle.fileno())
+
+	def _get_item_type(self, mode):
+		"""Return item type constant for specified inode protection mode."""
+		if stat.S_ISLNK(mode):
+			result = FileType.LINK
+
+		elif stat.S_ISDIR(mode):
+			result = FileType.DIRECTORY
+
+		elif stat.S_ISBLK(mode):
+			result = FileType.DEVICE_BLOCK
+
+		elif stat.S_ISCHR(mode):
+			result = FileType.DEVICE_CHARACTER
+
+		elif stat.S_ISSOCK(mode):
+			result = FileType.SOCKET
+
+		else:
+			result = FileType.REGULAR
+
+		return result
+
+	def _get_file_info(self, file_stat):
+		"""Create normal file information from result of stat call."""
+		return FileInfo(
+					size = file_stat.st_size,
+					mode = stat.S_IMODE(file_stat.st_mode),
+					user_id = file_stat.st_uid,
+					group_id = file_stat.st_gid,
+					time_modify = file_stat.st_mtime,
+					type = self._get_item_type(file_stat.st_mode),
+				)
+
 	def get_stat(self, path, relative_to=None, extended=False, follow=False):
 		"""Return file statistics"""
 		real_path = self.real_path(path, relative_to)
@@ -146,35 +189,10 @@ class LocalProvider(Provider):
 
 			return result
 
-		# get file type
-		if stat.S_ISLNK(file_stat.st_mode):
-			item_type = FileType.LINK
-
-		elif stat.S_ISDIR(file_stat.st_mode):
-			item_type = FileType.DIRECTORY
-
-		elif stat.S_ISBLK(file_stat.st_mode):
-			item_type = FileType.DEVICE_BLOCK
-
-		elif stat.S_ISCHR(file_stat.st_mode):
-			item_type = FileType.DEVICE_CHARACTER
-
-		elif stat.S_ISSOCK(file_stat.st_mode):
-			item_type = FileType.SOCKET
-
-		else:
-			item_type = FileType.REGULAR
-
+		# convert to file information
 		if not extended:
-			# create normal file information
-			result = FileInfo(
-						size = file_stat.st_size,
-						mode = stat.S_IMODE(file_stat.st_mode),
-						user_id = file_stat.st_uid,
-						group_id = file_stat.st_gid,
-						time_modify = file_stat.st_mtime,
-						type = item_type,
-					)
+			result = self._get_file_info(file_stat)
+
 		else:
 			# create extended file information
 			result = FileInfoExtended(
@@ -189,7 +207,7 @@ class LocalProvider(Provider):
 						time_access_ns = file_stat.st_atime_ns,
 						time_modify_ns = file_stat.st_mtime_ns,
 						time_change_ns = file_stat.st_ctime_ns,
-						type = item_type,
+						type = self._get_item_type(file_stat.st_mode),
 						device = file_stat.st_dev,
 						inode = file_stat.st_ino
 					)
@@ -241,6 +259,51 @@ class LocalProvider(Provider):
 		real_path = self.real_path(path, relative_to)
 		return os.listdir(real_path)
 
+	def list_dir_with_stat(self, path, relative_to=None):
+		"""Get directory list along with statistics for each item.
+
+		Directory entries returned by `os.scandir` already know their type so
+		only one stat call per item is needed, even for symbolic links.
+
+		"""
+		real_path = self.real_path(path, relative_to)
+		result = []
+
+		with os.scandir(real_path) as entries:
+			for entry in entries:
+				is_link = False
+
+				try:
+					is_link = entry.is_symlink()
+					file_info = self._get_file_info(entry.stat(follow_symlinks=True))
+
+				except OSError:
+					# handle invalid files and broken links
+					file_info = FileInfo(
+								size = 0,
+								mode = 0,
+								user_id = 0,
+								group_id = 0,
+								time_modify = 0,
+								type = FileType.INVALID,
+							)
+
+				result.append(DirectoryEntry(entry.name, file_info, is_link))
+
+		return result
+
+	def get_directory_validator(self, path, relative_to=None):
+		"""Return value which changes whenever content of directory changes."""
+		real_path = self.real_path(path, relative_to)
+
+		try:
+			directory_stat = os.stat(real_path)
+
+		except OSError:
+			return None
+
+		return (directory_stat.st_dev, directory_stat.st_ino, directory_stat.st_mtime_ns)
+
 	def get_root_path(self, path):
 		"""Get root for specified path"""
 		return 'file:///' if path.startswith('file://') else os.path.sep
@@ -292,5 +355,6 @@ class LocalProvider(Provider):
 			Support.SET_OWNER,
 			Support.SET_ACCESS,
 			Support.SET_TIMESTAMP,
-			Support.SYSTEM_SIZE
+			Support.SYSTEM_SIZE,
+			Support.CLONE
 		)
@@ -61,9 +61,9 @@ class TrashList(FileList):
 			# perform removal
 			operation.start()
 
-	def change_path(self, path=None, selected=None):
+	def change_path(self, path=None, selected=None, reload=False):
 		"""Change file list path."""
 		if path is not None and not path.startswith('trash://'):
 			path = 'trash:///'
 
-		FileList.change_path(self, path, selected)
+		FileList.change_path(self, path, selected, reload)
@@ -0,0 +1,52 @@
+from __future__ import absolute_import
+
+import pwd
+import grp
+import time
+
+from threading import Lock
+
+
+class NameCache:
+	"""Cache of names resolved from numeric user or group ids.
+
+	Resolving names can involve network services so each id is looked up
+	only once and result is kept until it expires. Ids without name are
+	represented by their number.
+
+	"""
+
+	timeout = 300  # seconds before resolved name is looked up again
+
+	def __init__(self, resolve):
+		self._resolve = resolve
+		self._names = {}
+		self._lock = Lock()
+
+	def get_name(self, item_id):
+		"""Return name for specified id."""
+		now = time.monotonic()
+		cached = self._names.get(item_id)
+
+		if cached is not None and cached[1] > now:
+			return cached[0]
+
+		try:
+			name = self._resolve(item_id)
+		except (KeyError, OverflowError):
+			name = str(item_id)
+
+		with self._lock:
+			self._names[item_id] = (name, now + self.timeout)
+
+		return name
+
+	def clear(self):
+		"""Forget all resolved names."""
+		with self._lock:
+			self._names.clear()
+
+
+# caches shared by the whole process
+user_names = NameCache(lambda user_id: pwd.getpwuid(user_id).pw_name)
+group_names = NameCache(lambda group_id: grp.getgrgid(group_id).gr_name)
@@ -4,12 +4,15 @@ from gi.repository import Gtk
 from sunflower.plugins.file_list.file_list import Column
 from sunflower.plugins.file_list.plugin import FileList
 from sunflower.plugin_base.column_extension import ColumnExtension
+from .name_cache import user_names, group_names
 
 
 def register_plugin(application):
 	"""Register plugin class with application"""
 	application.register_column_extension(FileList, OwnerColumn)
 	application.register_column_extension(FileList, GroupColumn)
+	application.register_column_extension(FileList, OwnerNameColumn)
+	application.register_column_extension(FileList, GroupNameColumn)
 
 
 class BaseColumn(ColumnExtension):
@@ -97,3 +100,63 @@ class GroupColumn(BaseColumn):
 	def get_sort_column(self):
 		"""Return sort column"""
 		return Column.GROUP_ID
+
+
+class OwnerNameColumn(BaseColumn):
+	"""Adds support for displaying owner name in item list"""
+
+	def __set_cell_data(self, column, cell, store, selected_iter, data=None):
+		"""Set column value"""
+		if store.get_value(selected_iter, Column.IS_PARENT_DIR):
+			value = ''
+		else:
+			value = user_names.get_name(store.get_value(selected_iter, Column.USER_ID))
+
+		cell.set_property('text', value)
+
+	def _create_column(self):
+		"""Configure column"""
+		BaseColumn._create_column(self)
+		self._column.set_cell_data_func(self._cell_renderer, self.__set_cell_data)
+
+	def _get_column_name(self):
+		"""Returns column name"""
+		return 'owner_name'
+
+	def _get_column_title(self):
+		"""Returns column title"""
+		return _('Owner name')
+
+	def get_sort_column(self):
+		"""Return sort column"""
+		return Column.USER_ID
+
+
+class GroupNameColumn(BaseColumn):
+	"""Adds support for displaying group name in item list"""
+
+	def __set_cell_data(self, column, cell, store, selected_iter, data=None):
+		"""Set column value"""
+		if store.get_value(selected_iter, Column.IS_PARENT_DIR):
+			value = ''
+		else:
+			value = group_names.get_name(store.get_value(selected_iter, Column.GROUP_ID))
+
+		cell.set_property('text', value)
+
+	def _create_column(self):
+		"""Configure column"""
+		BaseColumn._create_column(self)
+		self._column.set_cell_data_func(self._cell_renderer, self.__set_cell_data)
+
+	def _get_column_name(self):
+		"""Returns column name"""
+		return 'group_name'
+
+	def _get_column_title(self):
+		"""Returns column title"""
+		return _('Group name')
+
+	def get_sort_column(self):
+		"""Return sort column"""
+		return Column.GROUP_ID
@@ -0,0 +1,83 @@
+from __future__ import absolute_import
+
+from queue import Queue, Empty as QueueEmptyException
+from threading import Thread, Lock
+
+
+class DirectoryPrefetcher:
+	"""Lists directories in background ahead of time and stores results in
+	provider listing cache so changing to them doesn't need to wait.
+
+	Prefetching is only a hint, errors are silently ignored and requests
+	are dropped when too many are already waiting.
+
+	"""
+
+	worker_count = 2  # number of threads listing directories
+	pending_limit = 8  # maximum number of directories waiting to be listed
+	entry_limit = 20000  # listings with more items than this are not stored
+
+	def __init__(self, application):
+		self._application = application
+		self._queue = Queue()
+		self._pending = set()
+		self._lock = Lock()
+		self._workers = []
+
+	def __start_workers(self):
+		"""Start worker threads if they are not already running."""
+		while len(self._workers) < self.worker_count:
+			worker = Thread(target=self.__list_directories, daemon=True)
+			worker.start()
+			self._workers.append(worker)
+
+	def __list_directories(self):
+		"""Threaded method used for listing queued directories."""
+		while True:
+			key, provider, path = self._queue.get()
+
+			try:
+				# directory is already in cache
+				if provider.get_cached_listing(path) is not None:
+					continue
+
+				listing = provider.list_dir_with_stat(path)
+
+				if len(listing) <= self.entry_limit:
+					provider.cache_listing(path, listing)
+
+			except Exception:
+				# silently ignore errors
+				pass
+
+			finally:
+				with self._lock:
+					self._pending.discard(key)
+
+	def prefetch(self, provider, path):
+		"""Queue directory listing for specified path. Returns False if request
+		was dropped because same path is already waiting or queue is full."""
+		key = (provider.__class__, path)
+
+		with self._lock:
+			if key in self._pending or len(self._pending) >= self.pending_limit:
+				return False
+
+			self._pending.add(key)
+			self.__start_workers()
+
+		self._queue.put((key, provider, path))
+
+		return True
+
+	def cancel_all(self):
+		"""Discard all waiting requests."""
+		with self._lock:
+			while True:
+				try:
+					key, provider, path = self._queue.get(False)
+
+				except QueueEmptyException:
+					break
+
+				self._pending.discard(key)
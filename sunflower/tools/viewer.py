@@ -44,11 +44,7 @@ class Viewer(Gtk.Window):
 
 		# detect mime type
 		associations_manager = self._application.associations_manager
-		self._mime_type = associations_manager.get_mime_type(path)
-
-		if associations_manager.is_mime_type_unknown(self._mime_type):
-			data = associations_manager.get_sample_data(path, provider)
-			self._mime_type = associations_manager.get_mime_type(data=data)
+		self._mime_type = associations_manager.sniff_mime_type(path, provider)
 
 		# configure window
 		display_filename = decode_file_name(os.path.basename(self.path))
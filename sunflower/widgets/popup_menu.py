@@ -233,27 +233,28 @@ class PopupMenu:
 		self._selected_path = None
 
 	def __handle_emblem_toggle(self, widget, emblem=None):
-		"""Handle toggling emblem for current path."""
+		"""Handle toggling emblem for current path and other selected items."""
 		manager = self._application.emblem_manager
-		path, item_name = os.path.split(self._selected_path)
-
-		update_method = (
-					self._application.emblem_manager.remove_emblem,
-					self._application.emblem_manager.add_emblem
-				)[widget.get_active()]
-		update_method(path, item_name, emblem)
-
-		# notify monitor of our change
 		parent = self._provider.get_parent()
 		parent_path = self._provider.get_path()
 
-		if parent_path == self._provider.get_root_path(parent_path):
-			item_path = self._selected_path[len(parent_path):]
-		else:
-			item_path = self._selected_path[len(parent_path) + 1:]
+		# apply to all selected items when menu was shown for one of them
+		selection = self._provider.get_selection()
+		if not selection or self._selected_path not in selection:
+			selection = [self._selected_path]
+
+		manager.apply_emblem([os.path.split(path) for path in selection], emblem, widget.get_active())
 
+		# notify monitor of our change
 		queue = parent.get_monitor().get_queue()
-		queue.put((MonitorSignals.EMBLEM_CHANGED, item_path, None))
+
+		for selected_path in selection:
+			if parent_path == self._provider.get_root_path(parent_path):
+				item_path = selected_path[len(parent_path):]
+			else:
+				item_path = selected_path[len(parent_path) + 1:]
+
+			queue.put((MonitorSignals.EMBLEM_CHANGED, item_path, None))
 
 	def _create_menu_item(self, label, container, submenu_name=None, handler=None):
 		"""Create menu item and pack in provided container."""
@@ -302,8 +303,7 @@ class PopupMenu:
 		# try to detect by content
 		if associations_manager.is_mime_type_unknown(mime_type):
 			try:
-				data = associations_manager.get_sample_data(path, provider)
-				mime_type = associations_manager.get_mime_type(data=data)
+				mime_type = associations_manager.sniff_mime_type(path, provider)
 			except IsADirectoryError:
 				mime_type = 'inode/directory'
 
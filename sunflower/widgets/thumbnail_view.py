@@ -1,7 +1,9 @@
 import os
 import gi
 
-from gi.repository import Gtk, Gdk, GObject, GdkPixbuf
+from collections import OrderedDict
+from threading import Thread, Condition
+from gi.repository import Gtk, Gdk, GObject, GLib, GdkPixbuf
 
 try:
 	# try to import module
@@ -12,6 +14,18 @@ except:
 	USE_FACTORY = False
 
 
+def create_thumbnail_factory(size=None):
+	"""Return thumbnail factory for specified size or None when
+	Gnome thumbnail factory is not available."""
+	if not USE_FACTORY:
+		return None
+
+	if size is None:
+		size = GnomeDesktop.DesktopThumbnailSize.NORMAL
+
+	return GnomeDesktop.DesktopThumbnailFactory.new(size)
+
+
 class ThumbnailView:
 	"""Load and display images from Gnome thumbnail factory storage.
 
@@ -19,8 +33,15 @@ class ThumbnailView:
 	needed. This class *WILL* try to create thumbnails as well as load
 	them cached.
 
+	Thumbnails are looked up and generated by worker threads. Requesting
+	new thumbnail discards all requests still waiting to be processed
+	and recently used thumbnails are kept in memory.
+
 	"""
 
+	worker_count = 2  # number of threads loading and generating thumbnails
+	cache_size = 64  # number of thumbnails kept in memory
+
 	def __init__(self, parent, size=None):
 		self.popover = Gtk.Popover.new()
 
@@ -37,20 +58,83 @@ class ThumbnailView:
 		self._parent = parent
 		self._thumbnail_size = size
 
+		# asynchronous loading
+		self._cache = OrderedDict()
+		self._requests = OrderedDict()
+		self._condition = Condition()
+		self._workers = []
+		self._current = None
+
 		# create thumbnail factory
-		if USE_FACTORY:
-			# set default thumbnail size
-			if self._thumbnail_size is None:
-				self._thumbnail_size = GnomeDesktop.DesktopThumbnailSize.NORMAL
+		self._factory = create_thumbnail_factory(self._thumbnail_size)
+
+	def __start_workers(self):
+		"""Start worker threads if they are not already running."""
+		while len(self._workers) < self.worker_count:
+			worker = Thread(target=self.__process_requests, daemon=True)
+			worker.start()
+			self._workers.append(worker)
+
+	def __process_requests(self):
+		"""Threaded method which loads requested thumbnails."""
+		while True:
+			with self._condition:
+				while not self._requests:
+					self._condition.wait()
+
+				uri, mime_type = self._requests.popitem(last=False)
 
-			# create a factory
-			self._factory = GnomeDesktop.DesktopThumbnailFactory.new(self._thumbnail_size)
+			try:
+				thumbnail = self.get_thumbnail(uri, mime_type)
+			except Exception:
+				thumbnail = None
 
+			GLib.idle_add(self.__thumbnail_ready, uri, thumbnail)
+
+	def __thumbnail_ready(self, uri, thumbnail):
+		"""Store loaded thumbnail and show it if it was requested."""
+		self._cache[uri] = thumbnail
+		if len(self._cache) > self.cache_size:
+			self._cache.popitem(last=False)
+
+		if self._current is not None and self._current[0] == uri:
+			self.__show(*self._current)
+
+		return False
+
+	def __show(self, uri, widget, position):
+		"""Show cached thumbnail in popover."""
+		thumbnail = self._cache[uri]
+		self._cache.move_to_end(uri)
+
+		if thumbnail is not None:
+			self._image.set_from_pixbuf(thumbnail)
 		else:
-			self._factory = None
+			self._image.set_from_icon_name('gtk-missing-image', Gtk.IconSize.DIALOG)
+
+		self.popover.set_relative_to(widget)
+		self.popover.set_pointing_to(position)
+		self.popover.show()
+
+	def __request(self, uri):
+		"""Queue thumbnail for loading unless it's already cached or waiting."""
+		if uri in self._cache or uri in self._requests:
+			return
+
+		mime_type = self._parent._parent.associations_manager.get_mime_type(uri)
+		self._requests[uri] = mime_type
+		self.__start_workers()
+		self._condition.notify()
+
+	def cancel_requests(self):
+		"""Discard all thumbnail requests waiting to be processed."""
+		with self._condition:
+			self._requests.clear()
 
 	def hide(self):
 		"""Hide tooltip."""
+		self._current = None
+		self.cancel_requests()
 		self.popover.hide()
 
 	def can_have_thumbnail(self, uri):
@@ -61,13 +145,15 @@ class ThumbnailView:
 		mime_type = self._parent._parent.associations_manager.get_mime_type(uri)
 		return self._factory.can_thumbnail(uri, mime_type, 0)
 
-	def get_thumbnail(self, uri):
-		"""Return thumbnail pixbuf for specified URI"""
+	def get_thumbnail(self, uri, mime_type=None):
+		"""Return thumbnail pixbuf for specified URI. This method blocks
+		while thumbnail is loaded or generated."""
 		if not USE_FACTORY:
 			return None
 
 		result = None
-		mime_type = self._parent._parent.associations_manager.get_mime_type(uri)
+		if mime_type is None:
+			mime_type = self._parent._parent.associations_manager.get_mime_type(uri)
 
 		# check for existing thumbnail
 		thumbnail_file = self._factory.lookup(uri, 0)
@@ -75,7 +161,7 @@ class ThumbnailView:
 			result = GdkPixbuf.Pixbuf.new_from_file(thumbnail_file)
 
 		# create thumbnail
-		elif self.can_have_thumbnail(uri):
+		elif self._factory.can_thumbnail(uri, mime_type, 0):
 			result = self._factory.generate_thumbnail(uri, mime_type)
 
 			if result is not None:
@@ -83,15 +169,28 @@ class ThumbnailView:
 
 		return result
 
+	def prefetch_thumbnails(self, uris):
+		"""Queue thumbnails for loading without showing them."""
+		if not USE_FACTORY:
+			return
+
+		with self._condition:
+			for uri in uris:
+				self.__request(uri)
+
 	def show_thumbnail(self, uri, widget, position):
 		"""Show thumbnail for specified image"""
-		thumbnail = self.get_thumbnail(uri)
+		self._current = (uri, widget, position)
 
-		if thumbnail is not None:
-			self._image.set_from_pixbuf(thumbnail)
-		else:
-			self._image.set_from_icon_name('gtk-missing-image', Gtk.IconSize.DIALOG)
+		# thumbnail is already loaded
+		if uri in self._cache:
+			self.__show(uri, widget, position)
+			return
 
-		self.popover.set_relative_to(widget)
-		self.popover.set_pointing_to(position)
-		self.popover.show()
+		# don't point to wrong item while loading
+		self.popover.hide()
+
+		# previously requested thumbnails are no longer needed
+		with self._condition:
+			self._requests.clear()
+			self.__request(uri)